@@ -1,16 +1,25 @@
 """
 API routes for Vietnam Housing Price Prediction - Using Real ML Models
 """
+import asyncio
+import json
+from collections import OrderedDict
 from datetime import timedelta
-from typing import Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 import logging
-import numpy as np
 
-from ..core import settings, create_access_token, authenticate_user, get_current_user
+from ..core import (
+    settings, create_access_token, authenticate_user, get_current_user,
+    security, invalidate_token
+)
 from ..services import llm_service
 from ..services.tree_preprocess_service import get_preprocess_service
 from ..services.tree_model_service import get_model_service
+from ..services.prediction_batcher import get_prediction_batcher
 from ..schemas import (
     LoginRequest, LoginResponse,
     ParseTextRequest, ParseResponse,
@@ -28,9 +37,51 @@ router = APIRouter()
 # Get singleton services
 preprocess_service = get_preprocess_service()
 model_service = get_model_service()
+prediction_batcher = get_prediction_batcher()
+
+METADATA_FILENAME = "linear_regression_(ridge)_20251205_194841_metadata.json"
+
+# LRU cache of single-model and ensemble predictions for repeated inputs
+# (only touched on the event loop, so no lock is needed)
+_predict_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_predict_cache_hits = 0
+
+
+def _predict_cache_key(features: Dict[str, Any], model_name: Optional[str]) -> Optional[tuple]:
+    """
+    Exact-match cache key (model_name None = ensemble), or None if caching
+    is disabled or a feature value isn't hashable
+    """
+    if settings.PREDICT_CACHE_SIZE <= 0:
+        return None
+    try:
+        key = (model_name, frozenset(features.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
 
+def _predict_cache_get(key: Optional[tuple]) -> Optional[Dict[str, Any]]:
+    """Look up a cached prediction (returns a copy)"""
+    global _predict_cache_hits
+    if key is None or key not in _predict_cache:
+        return None
+    _predict_cache.move_to_end(key)
+    _predict_cache_hits += 1
+    return dict(_predict_cache[key])
 
-def ml_predict(features: Dict[str, Any], model_name: str = "lightgbm") -> Dict[str, Any]:
+
+def _predict_cache_put(key: Optional[tuple], result: Dict[str, Any]) -> None:
+    """Store a prediction, evicting the least recently used entries"""
+    if key is None:
+        return
+    _predict_cache[key] = dict(result)
+    while len(_predict_cache) > settings.PREDICT_CACHE_SIZE:
+        _predict_cache.popitem(last=False)
+
+
+async def ml_predict(features: Dict[str, Any], model_name: str = "lightgbm") -> Dict[str, Any]:
     """
     Make prediction using real ML models with proper preprocessing
 
@@ -41,14 +92,17 @@ def ml_predict(features: Dict[str, Any], model_name: str = "lightgbm") -> Dict[s
     Returns:
         Dictionary with prediction result and confidence
     """
-    try:
-        # Step 1: Preprocess features (41 features with label encoding)
-        features_df = preprocess_service.preprocess(features)
-        logger.info(f"Preprocessed features shape: {features_df.shape}")
+    cache_key = _predict_cache_key(features, model_name)
+    cached = _predict_cache_get(cache_key)
+    if cached is not None:
+        return cached
 
-        # Step 2: Make prediction using tree model
-        result = model_service.predict(features_df, model_name=model_name)
+    try:
+        # Preprocess (41 features with label encoding) and predict with the tree
+        # model, micro-batched with other concurrent requests for the same model
+        result = await prediction_batcher.submit(features, model_name=model_name)
 
+        _predict_cache_put(cache_key, result)
         return result
 
     except Exception as e:
@@ -56,10 +110,46 @@ def ml_predict(features: Dict[str, Any], model_name: str = "lightgbm") -> Dict[s
         raise ValueError(f"Prediction failed: {str(e)}")
 
 
+# Locations probed for the model metadata file
+METADATA_SEARCH_PATHS = (
+    Path(__file__).parent.parent.parent / "models" / "saved_models" / METADATA_FILENAME,
+    Path(__file__).parent.parent.parent.parent / "notebooks" / "models" / "saved_models" / METADATA_FILENAME,
+)
+_metadata_path: Optional[Path] = None
+
+# Returned when no metadata file exists
+DEFAULT_METADATA: Dict[str, Any] = {
+    "name": "Linear Regression (Ridge)",
+    "feature_names": [],
+    "params": {},
+    "training_time": 0,
+    "timestamp": ""
+}
+
+
+def _resolve_metadata_path() -> Optional[Path]:
+    """Find the model metadata file (cached once found; re-probed while missing)"""
+    global _metadata_path
+    if _metadata_path is None:
+        _metadata_path = next((path for path in METADATA_SEARCH_PATHS if path.exists()), None)
+    return _metadata_path
+
+
+@lru_cache(maxsize=4)
+def _load_metadata_cached(path: Path, mtime: float) -> Dict[str, Any]:
+    """Parse the metadata JSON once per (path, mtime)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Static response of the API root (settings don't change at runtime)
+ROOT_RESPONSE: Dict[str, Any] = {"message": f"Welcome to {settings.APP_NAME} v{settings.APP_VERSION}"}
+
+
 # Health endpoints
 @router.get("/", response_model=MessageResponse)
 async def root():
-    return {"message": f"Welcome to {settings.APP_NAME} v{settings.APP_VERSION}"}
+    return ROOT_RESPONSE
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -67,8 +157,9 @@ async def health_check():
     return {
         "status": "healthy",
         "version": settings.APP_VERSION,
-        "models_loaded": len(model_service.get_available_models()),
-        "llm_available": llm_service.is_available()
+        "models_loaded": model_service.get_available_count(),
+        "llm_available": llm_service.is_available(),
+        "predict_cache_hits": _predict_cache_hits
     }
 
 
@@ -89,43 +180,22 @@ async def get_model_info(model_name: str):
     return info
 
 
-@router.get("/models/metadata")
+@router.get("/models/metadata", response_model=Dict[str, Any])
 async def get_model_metadata():
     """
     Get model metadata with feature names for extracting categorical values
     Returns metadata from the default linear regression model
     """
-    import json
-    import os
-    from pathlib import Path
-
-    # Try to find metadata file in multiple locations
-    possible_paths = [
-        Path(__file__).parent.parent.parent / "models" / "saved_models" / "linear_regression_(ridge)_20251205_194841_metadata.json",
-        Path(__file__).parent.parent.parent.parent / "notebooks" / "models" / "saved_models" / "linear_regression_(ridge)_20251205_194841_metadata.json",
-    ]
-
-    metadata_path = None
-    for path in possible_paths:
-        if path.exists():
-            metadata_path = path
-            break
+    metadata_path = _resolve_metadata_path()
 
     if not metadata_path:
         # Return a default metadata structure if file not found
         logger.warning("Model metadata file not found, returning default metadata")
-        return {
-            "name": "Linear Regression (Ridge)",
-            "feature_names": [],
-            "params": {},
-            "training_time": 0,
-            "timestamp": ""
-        }
+        return DEFAULT_METADATA
 
     try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-        return metadata
+        # mtime is part of the cache key so edits to the file are picked up
+        return _load_metadata_cached(metadata_path, metadata_path.stat().st_mtime)
     except Exception as e:
         logger.error(f"Error reading metadata file: {e}")
         raise HTTPException(status_code=500, detail="Error reading model metadata")
@@ -153,11 +223,15 @@ async def login(request: LoginRequest):
 
 
 @router.post("/auth/logout", response_model=MessageResponse)
-async def logout(current_user: dict = Depends(get_current_user)):
+async def logout(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    invalidate_token(credentials.credentials)
     return {"message": f"User {current_user['username']} logged out successfully"}
 
 
-@router.get("/auth/me")
+@router.get("/auth/me", response_model=Dict[str, Any])
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     return current_user
 
@@ -172,7 +246,7 @@ async def parse_text(request: ParseTextRequest):
         )
 
     try:
-        features = llm_service.parse(request.text, verbose=request.verbose)
+        features = await llm_service.aparse(request.text, verbose=request.verbose)
         return {
             "success": bool(features),
             "features": features,
@@ -183,80 +257,108 @@ async def parse_text(request: ParseTextRequest):
         raise HTTPException(status_code=500, detail=f"Parsing failed: {str(e)}")
 
 
+def predict_ensemble(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Preprocess and predict with all models (blocking; run via asyncio.to_thread)"""
+    features_df = preprocess_service.preprocess(features)
+    return model_service.predict_all_models(features_df)
+
+
+async def ml_predict_ensemble(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Ensemble prediction with all models, served from the prediction cache on repeats"""
+    cache_key = _predict_cache_key(features, None)
+    cached = _predict_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = await asyncio.to_thread(predict_ensemble, features)
+    _predict_cache_put(cache_key, result)
+    return result
+
+
 # Prediction endpoints
-@router.post("/predict", response_model=PredictionResponse | EnsemblePredictionResponse)
+@router.post(
+    "/predict",
+    response_model=PredictionResponse | EnsemblePredictionResponse,
+    response_model_exclude_none=True
+)
 async def predict(request: PredictRequest):
+    features_used = request.features if request.include_features else None
+
     try:
         if request.use_ensemble:
             # Use all available models for ensemble prediction
-            features_df = preprocess_service.preprocess(request.features)
-            ensemble_result = model_service.predict_all_models(features_df)
-
-            return {
-                "ensemble_prediction": ensemble_result["ensemble_prediction"],
-                "ensemble_prediction_formatted": format_price(ensemble_result["ensemble_prediction"]),
-                "ensemble_std": ensemble_result["ensemble_std"],
-                "confidence": ensemble_result["ensemble_confidence"],
-                "individual_predictions": ensemble_result["individual_predictions"],
-                "models_used": ensemble_result["models_used"],
-                "features_used": request.features
-            }
+            ensemble_result = await ml_predict_ensemble(request.features)
+
+            return EnsemblePredictionResponse(
+                ensemble_prediction=ensemble_result["ensemble_prediction"],
+                ensemble_prediction_formatted=format_price(ensemble_result["ensemble_prediction"]),
+                ensemble_std=ensemble_result["ensemble_std"],
+                confidence=ensemble_result["ensemble_confidence"],
+                individual_predictions=ensemble_result["individual_predictions"],
+                models_used=ensemble_result["models_used"],
+                features_used=features_used
+            )
         else:
             # Single model prediction
             model_name = request.model_name or settings.DEFAULT_MODEL
-            result = ml_predict(request.features, model_name=model_name)
+            result = await ml_predict(request.features, model_name=model_name)
 
-            return {
-                "prediction": result["prediction"],
-                "prediction_formatted": format_price(result["prediction"]),
-                "confidence": result["confidence"],
-                "model_used": result["model_used"],
-                "features_used": request.features
-            }
+            return PredictionResponse(
+                prediction=result["prediction"],
+                prediction_formatted=format_price(result["prediction"]),
+                confidence=result["confidence"],
+                model_used=result["model_used"],
+                features_used=features_used
+            )
 
     except Exception as e:
         logger.error(f"Prediction failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
-@router.post("/parse-and-predict", response_model=PredictionResponse | EnsemblePredictionResponse)
+@router.post(
+    "/parse-and-predict",
+    response_model=PredictionResponse | EnsemblePredictionResponse,
+    response_model_exclude_none=True
+)
 async def parse_and_predict(request: ParseAndPredictRequest):
     if not llm_service.is_available():
         raise HTTPException(status_code=503, detail="LLM parsing not available")
 
     try:
         # Parse text to extract features
-        features = llm_service.parse(request.text, verbose=False)
+        features = await llm_service.aparse(request.text, verbose=False)
 
         if not features:
             raise HTTPException(status_code=400, detail="Failed to parse features")
 
+        features_used = features if request.include_features else None
+
         if request.use_ensemble:
             # Use all available models for ensemble prediction
-            features_df = preprocess_service.preprocess(features)
-            ensemble_result = model_service.predict_all_models(features_df)
-
-            return {
-                "ensemble_prediction": ensemble_result["ensemble_prediction"],
-                "ensemble_prediction_formatted": format_price(ensemble_result["ensemble_prediction"]),
-                "ensemble_std": ensemble_result["ensemble_std"],
-                "confidence": ensemble_result["ensemble_confidence"],
-                "individual_predictions": ensemble_result["individual_predictions"],
-                "models_used": ensemble_result["models_used"],
-                "features_used": features
-            }
+            ensemble_result = await ml_predict_ensemble(features)
+
+            return EnsemblePredictionResponse(
+                ensemble_prediction=ensemble_result["ensemble_prediction"],
+                ensemble_prediction_formatted=format_price(ensemble_result["ensemble_prediction"]),
+                ensemble_std=ensemble_result["ensemble_std"],
+                confidence=ensemble_result["ensemble_confidence"],
+                individual_predictions=ensemble_result["individual_predictions"],
+                models_used=ensemble_result["models_used"],
+                features_used=features_used
+            )
         else:
             # Single model prediction
             model_name = request.model_name or settings.DEFAULT_MODEL
-            result = ml_predict(features, model_name=model_name)
-
-            return {
-                "prediction": result["prediction"],
-                "prediction_formatted": format_price(result["prediction"]),
-                "confidence": result["confidence"],
-                "model_used": result["model_used"],
-                "features_used": features
-            }
+            result = await ml_predict(features, model_name=model_name)
+
+            return PredictionResponse(
+                prediction=result["prediction"],
+                prediction_formatted=format_price(result["prediction"]),
+                confidence=result["confidence"],
+                model_used=result["model_used"],
+                features_used=features_used
+            )
 
     except HTTPException:
         raise
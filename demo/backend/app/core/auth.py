@@ -1,16 +1,52 @@
 """
 Authentication dependencies
 """
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from .config import settings
 from .security import decode_access_token
 
 
 # Security scheme
 security = HTTPBearer()
 
+# Decoded-token cache: token -> (user data, expires_at as unix time)
+# Entries never outlive the token's own "exp" claim
+_token_cache: Dict[str, Tuple[dict, float]] = {}
+
+
+def _get_cached_user(token: str) -> Optional[dict]:
+    """Return cached user data for a token, or None if missing/expired"""
+    entry = _token_cache.get(token)
+    if entry is None:
+        return None
+
+    user, expires_at = entry
+    if time.time() >= expires_at:
+        _token_cache.pop(token, None)
+        return None
+    return user
+
+
+def _cache_user(token: str, user: dict, token_exp: Optional[float]) -> None:
+    """Cache user data for a verified token"""
+    expires_at = time.time() + settings.TOKEN_CACHE_TTL_SECONDS
+    if token_exp is not None:
+        expires_at = min(expires_at, float(token_exp))
+
+    if len(_token_cache) >= settings.TOKEN_CACHE_MAX_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        _token_cache.pop(next(iter(_token_cache)), None)
+    _token_cache[token] = (user, expires_at)
+
+
+def invalidate_token(token: str) -> None:
+    """Drop a token from the decoded-token cache (e.g. on logout)"""
+    _token_cache.pop(token, None)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -29,6 +65,10 @@ async def get_current_user(
     """
     token = credentials.credentials
 
+    cached_user = _get_cached_user(token)
+    if cached_user is not None:
+        return cached_user
+
     try:
         payload = decode_access_token(token)
         username: str = payload.get("sub")
@@ -40,7 +80,9 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return {"username": username}
+        user = {"username": username}
+        _cache_user(token, user, payload.get("exp"))
+        return user
 
     except Exception as e:
         raise HTTPException(
@@ -2,6 +2,7 @@
 Configuration settings for the backend API
 """
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import List
 from pydantic_settings import BaseSettings
@@ -23,6 +24,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    TOKEN_CACHE_TTL_SECONDS: int = 60  # Cache decoded tokens to skip re-verifying
+    TOKEN_CACHE_MAX_SIZE: int = 4096
 
     # Hardcoded accounts for demo
     DEMO_ACCOUNTS: dict = {
@@ -48,8 +51,31 @@ class Settings(BaseSettings):
     # Default model for prediction
     DEFAULT_MODEL: str = "lightgbm"
 
+    # Compile LightGBM/XGBoost to native code at startup (needs lleaves /
+    # treelite + tl2cgen and a C compiler; falls back to the pickled models)
+    COMPILE_TREE_MODELS: bool = False
+
+    # Micro-batching for single-model /predict calls
+    PREDICT_BATCH_MAX_SIZE: int = 32
+    PREDICT_BATCH_MAX_LATENCY_MS: float = 5.0
+
+    # Exact-match LRU cache of single-model predictions (0 = disabled)
+    PREDICT_CACHE_SIZE: int = 4096
+
+    # uvicorn worker processes for `python -m app.main` (0 = half the CPU count)
+    UVICORN_WORKERS: int = 0
+
+    # Prediction threads per model in each worker (0 = library default, i.e. all cores)
+    MODEL_NUM_THREADS: int = 1
+
+    # Worker threads for blocking preprocessing/inference/LLM calls (0 = CPU count)
+    THREADPOOL_MAX_WORKERS: int = 0
+
     # LLM Parser Settings
     HUGGINGFACE_TOKEN: str = os.getenv("HUGGINGFACE_TOKEN", "")
+    LLM_PARSE_CACHE_SIZE: int = 1024  # Exact-match cache of parsed descriptions
+    HF_MAX_CONCURRENCY: int = 8  # Max in-flight HuggingFace requests
+    WARMUP_LLM: bool = False  # Send one parse request at startup (uses the HF API quota)
 
     # Feature names (should match training data)
     REQUIRED_FEATURES: List[str] = [
@@ -60,6 +86,13 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
 
+    @cached_property
+    def allowed_origins_list(self) -> List[str]:
+        """ALLOWED_ORIGINS parsed once ("*" or comma-separated list)"""
+        if self.ALLOWED_ORIGINS == "*":
+            return ["*"]
+        return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
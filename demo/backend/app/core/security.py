@@ -83,6 +83,5 @@ def authenticate_user(username: str, password: str) -> bool:
     Returns:
         True if authentication successful, False otherwise
     """
-    if username in settings.DEMO_ACCOUNTS:
-        return settings.DEMO_ACCOUNTS[username] == password
-    return False
+    expected = settings.DEMO_ACCOUNTS.get(username)
+    return expected is not None and expected == password
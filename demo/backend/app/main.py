@@ -1,14 +1,27 @@
 """
 Main FastAPI application
 """
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
+
+# Size OpenMP thread teams before LightGBM/XGBoost/numpy are imported: with N
+# uvicorn workers, N all-core teams would oversubscribe the CPU
+if settings.MODEL_NUM_THREADS > 0:
+    os.environ.setdefault("OMP_NUM_THREADS", str(settings.MODEL_NUM_THREADS))
+
 from .api import router
-from .services import model_service, llm_service
+from .services import llm_service
+from .services.prediction_batcher import get_prediction_batcher
+from .services.tree_model_service import get_model_service
+from .services.tree_preprocess_service import get_preprocess_service
 
 
 # Configure logging
@@ -18,6 +31,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Representative input used to warm up preprocessing and the models
+WARMUP_FEATURES = {
+    "Area": 80, "Bedrooms": 3, "Bathrooms": 2, "Floors": 3,
+    "Frontage": 4, "AccessRoad": 5, "LegalStatus": "Sổ hồng",
+    "Furniture": "Đầy đủ", "District": "Quận 7", "City": "Hồ Chí Minh"
+}
+WARMUP_LLM_TEXT = "Nhà 120m2, 3PN, 2WC, quận 7"
+
+
+def warmup() -> None:
+    """Run a few throwaway predictions so the first request doesn't pay one-time costs"""
+    start = time.perf_counter()
+    tree_models = get_model_service()
+    tree_preprocess = get_preprocess_service()
+
+    features_df = tree_preprocess.preprocess(WARMUP_FEATURES)
+    batch_df = tree_preprocess.preprocess_batch([WARMUP_FEATURES] * 4)
+    for model_name in tree_models.get_available_models():
+        for _ in range(3):
+            tree_models.predict(features_df, model_name=model_name)
+        tree_models.predict_batch(batch_df, model_name=model_name)
+
+    logger.info(f"Model warmup finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if settings.WARMUP_LLM and llm_service.is_available():
+        start = time.perf_counter()
+        try:
+            llm_service.parse(WARMUP_LLM_TEXT, verbose=False)
+            logger.info(f"LLM warmup finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            logger.warning(f"LLM warmup failed: {str(e)}")
+
 
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
@@ -27,16 +72,31 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events
     """
     # Startup
-    logger.info("Starting up application...")
+    logger.info(f"Starting up application (pid {os.getpid()})...")
+
+    # Bounded default executor for the blocking work offloaded with asyncio.to_thread
+    max_workers = settings.THREADPOOL_MAX_WORKERS or os.cpu_count() or 1
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blocking")
+    asyncio.get_running_loop().set_default_executor(executor)
+    logger.info(f"Default thread pool: {max_workers} workers")
 
     # Load ML models
     try:
         logger.info("Loading ML models...")
+        model_service = get_model_service()
         model_service.load_models()
-        logger.info(f"Loaded {len(model_service.get_available_models())} models")
+        logger.info(f"Loaded {model_service.get_available_count()} models")
     except Exception as e:
         logger.error(f"Failed to load models: {str(e)}")
 
+    # Compile tree models to native code (optional, cached under models/compiled)
+    if settings.COMPILE_TREE_MODELS:
+        try:
+            logger.info("Compiling tree models...")
+            get_model_service().compile_models()
+        except Exception as e:
+            logger.warning(f"Model compilation failed: {str(e)}")
+
     # Initialize LLM service (will fail gracefully if token not set)
     try:
         logger.info("Initializing LLM service...")
@@ -48,12 +108,24 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"LLM service initialization failed: {str(e)}")
 
+    # Warm up preprocessing, models (and optionally the LLM) before traffic
+    try:
+        await asyncio.to_thread(warmup)
+    except Exception as e:
+        logger.warning(f"Warmup failed: {str(e)}")
+
+    # Start micro-batcher for /predict
+    prediction_batcher = get_prediction_batcher()
+    prediction_batcher.start()
+
     logger.info("Application startup complete")
 
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
+    await prediction_batcher.stop()
+    executor.shutdown(wait=False)
 
 
 # Create FastAPI app
@@ -65,14 +137,9 @@ app = FastAPI(
 )
 
 # Add CORS middleware
-# Parse ALLOWED_ORIGINS (can be "*" or comma-separated list)
-allowed_origins = ["*"] if settings.ALLOWED_ORIGINS == "*" else [
-    origin.strip() for origin in settings.ALLOWED_ORIGINS.split(",")
-]
-
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins,
+    allow_origins=settings.allowed_origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -82,16 +149,20 @@ app.add_middleware(
 app.include_router(router, prefix=settings.API_V1_PREFIX)
 
 
+# Static response of the root endpoint (settings don't change at runtime)
+ROOT_RESPONSE = {
+    "message": f"Welcome to {settings.APP_NAME}",
+    "version": settings.APP_VERSION,
+    "docs": "/docs",
+    "api": settings.API_V1_PREFIX
+}
+
+
 # Root endpoint (without prefix)
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "message": f"Welcome to {settings.APP_NAME}",
-        "version": settings.APP_VERSION,
-        "docs": "/docs",
-        "api": settings.API_V1_PREFIX
-    }
+    return ROOT_RESPONSE
 
 
 # Health check endpoint for deployment platforms (Render, Railway, etc.)
@@ -102,7 +173,7 @@ async def health_check():
     Returns basic health status without dependencies
     """
     try:
-        models_count = len(model_service.get_available_models())
+        models_count = get_model_service().get_available_count()
     except:
         models_count = 0
 
@@ -115,9 +186,12 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
+    # Reload mode only supports a single worker
+    workers = 1 if settings.DEBUG else (settings.UVICORN_WORKERS or max(1, (os.cpu_count() or 1) // 2))
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
+        workers=workers,
         reload=settings.DEBUG
     )
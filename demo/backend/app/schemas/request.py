@@ -2,7 +2,7 @@
 Request schemas for API endpoints
 """
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class LoginRequest(BaseModel):
@@ -10,13 +10,15 @@ class LoginRequest(BaseModel):
     username: str = Field(..., description="Username")
     password: str = Field(..., description="Password")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "username": "demo",
                 "password": "demo123"
             }
         }
+    )
 
 
 class ParseTextRequest(BaseModel):
@@ -24,13 +26,15 @@ class ParseTextRequest(BaseModel):
     text: str = Field(..., description="Real estate description in Vietnamese")
     verbose: bool = Field(False, description="Verbose output")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "text": "Nhà 120m2, 3 phòng ngủ, 2 toilet, quận 7, sổ hồng, hướng đông nam",
                 "verbose": False
             }
         }
+    )
 
 
 class PredictRequest(BaseModel):
@@ -38,9 +42,11 @@ class PredictRequest(BaseModel):
     features: Dict[str, Any] = Field(..., description="House features")
     model_name: Optional[str] = Field(None, description="Model to use (default: lightgbm)")
     use_ensemble: bool = Field(False, description="Use all models and return ensemble prediction")
+    include_features: bool = Field(True, description="Echo the input features back as features_used")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "features": {
                     "Area": 120,
@@ -57,6 +63,7 @@ class PredictRequest(BaseModel):
                 "use_ensemble": False
             }
         }
+    )
 
 
 class ParseAndPredictRequest(BaseModel):
@@ -64,12 +71,15 @@ class ParseAndPredictRequest(BaseModel):
     text: str = Field(..., description="Real estate description in Vietnamese")
     model_name: Optional[str] = Field(None, description="Model to use")
     use_ensemble: bool = Field(False, description="Use ensemble prediction")
+    include_features: bool = Field(True, description="Echo the parsed features back as features_used")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "text": "Nhà 120m2, 3PN, 2WC, quận 7, sổ hồng",
                 "model_name": "lightgbm",
                 "use_ensemble": False
             }
         }
+    )
@@ -30,7 +30,7 @@ class PredictionResponse(BaseModel):
     prediction_formatted: str = Field(..., description="Formatted prediction (e.g., '5.2 tỷ')")
     confidence: float = Field(..., description="Confidence score (0-100)")
     model_used: str = Field(..., description="Model name used for prediction")
-    features_used: Dict[str, Any] = Field(..., description="Features used for prediction")
+    features_used: Optional[Dict[str, Any]] = Field(None, description="Features used for prediction (omitted if include_features is false)")
 
 
 class EnsemblePredictionResponse(BaseModel):
@@ -41,7 +41,7 @@ class EnsemblePredictionResponse(BaseModel):
     confidence: float = Field(..., description="Ensemble confidence score (0-100)")
     individual_predictions: Dict[str, Any] = Field(..., description="Predictions from each model")
     models_used: List[str] = Field(..., description="List of models used")
-    features_used: Dict[str, Any] = Field(..., description="Features used for prediction")
+    features_used: Optional[Dict[str, Any]] = Field(None, description="Features used for prediction (omitted if include_features is false)")
 
 
 class ModelInfoResponse(BaseModel):
@@ -63,3 +63,4 @@ class HealthResponse(BaseModel):
     version: str = Field(..., description="API version")
     models_loaded: int = Field(..., description="Number of models loaded")
     llm_available: bool = Field(..., description="Whether LLM parsing is available")
+    predict_cache_hits: int = Field(0, description="Predictions served from the in-process cache")
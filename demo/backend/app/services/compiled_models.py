@@ -0,0 +1,115 @@
+"""
+Compiled Models - Native code versions of the tree models for faster inference
+LightGBM is compiled with lleaves (LLVM), XGBoost with Treelite + TL2cgen (gcc)
+"""
+import os
+import numpy as np
+from pathlib import Path
+from typing import Any, Callable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Both compilers are optional - without them the pickled models are used as-is
+try:
+    import lleaves
+except ImportError:
+    lleaves = None
+
+try:
+    import tl2cgen
+    import treelite
+except ImportError:
+    tl2cgen = None
+    treelite = None
+
+# A compiled predictor takes a float matrix (rows × features in training order)
+CompiledPredictor = Callable[[np.ndarray], np.ndarray]
+
+
+def _cache_stem(model_path: Path) -> str:
+    """Cache file name stem, keyed by model file name and mtime"""
+    return f"{model_path.stem}_{int(model_path.stat().st_mtime)}"
+
+
+def _compile_lightgbm(model: Any, model_path: Path, cache_dir: Path, num_threads: int) -> Optional[CompiledPredictor]:
+    """Compile a LightGBM model with lleaves (object file cached in cache_dir)"""
+    if lleaves is None:
+        logger.info("lleaves not installed - LightGBM stays interpreted")
+        return None
+
+    stem = _cache_stem(model_path)
+    model_file = cache_dir / f"{stem}.txt"
+    if not model_file.exists():
+        booster = model.booster_ if hasattr(model, "booster_") else model
+        booster.save_model(str(model_file))
+
+    compiled = lleaves.Model(model_file=str(model_file))
+    compiled.compile(cache=str(cache_dir / f"{stem}.o"))
+
+    n_jobs = num_threads if num_threads > 0 else os.cpu_count()
+    return lambda X: compiled.predict(np.asarray(X, dtype=np.float64), n_jobs=n_jobs)
+
+
+def _compile_xgboost(model: Any, model_path: Path, cache_dir: Path, num_threads: int) -> Optional[CompiledPredictor]:
+    """Compile an XGBoost model with Treelite + TL2cgen (shared library cached in cache_dir)"""
+    if tl2cgen is None:
+        logger.info("treelite/tl2cgen not installed - XGBoost stays interpreted")
+        return None
+
+    libpath = cache_dir / f"{_cache_stem(model_path)}.so"
+    if not libpath.exists():
+        booster = model.get_booster() if hasattr(model, "get_booster") else model
+        tl_model = treelite.frontend.from_xgboost(booster)
+        tl2cgen.export_lib(
+            tl_model,
+            toolchain="gcc",
+            libpath=str(libpath),
+            params={"parallel_comp": os.cpu_count() or 1},
+            verbose=False
+        )
+
+    predictor = tl2cgen.Predictor(str(libpath), nthread=num_threads if num_threads > 0 else None)
+
+    def predict(X: np.ndarray) -> np.ndarray:
+        dmat = tl2cgen.DMatrix(np.asarray(X, dtype=np.float32))
+        return np.asarray(predictor.predict(dmat)).reshape(len(X))
+
+    return predict
+
+
+COMPILERS = {
+    "lightgbm": _compile_lightgbm,
+    "xgboost": _compile_xgboost,
+}
+
+
+def compile_model(
+    model_name: str, model: Any, model_path: Path, cache_dir: Path, num_threads: int = 0
+) -> Optional[CompiledPredictor]:
+    """
+    Compile a loaded tree model to native code.
+
+    Args:
+        model_name: Model key (lightgbm / xgboost)
+        model: Loaded model object
+        model_path: Path of the pickled model (used as cache key)
+        cache_dir: Directory for the compiled artifacts
+        num_threads: Prediction threads (0 = library default)
+
+    Returns:
+        Predictor function, or None if the model can't be compiled here
+    """
+    compiler = COMPILERS.get(model_name)
+    if compiler is None:
+        return None
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        predictor = compiler(model, model_path, cache_dir, num_threads)
+        if predictor is not None:
+            logger.info(f"✓ Compiled {model_name} to native code")
+        return predictor
+    except Exception as e:
+        logger.warning(f"Failed to compile {model_name}, using the pickled model: {e}")
+        return None
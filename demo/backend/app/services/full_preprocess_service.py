@@ -4,7 +4,7 @@ Matches the preprocessing used during model training
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 import json
 import logging
 from pathlib import Path
@@ -17,12 +17,85 @@ logger = logging.getLogger(__name__)
 class FullPreprocessService:
     """Service for full preprocessing matching training pipeline"""
 
+    # Normalized input value -> one-hot category (lookup keys are lowercased)
+    DIRECTION_MAPPING = {
+        'đông': 'Đông',
+        'dong': 'Đông',
+        'east': 'Đông',
+        'e': 'Đông',
+        'tây': 'Tây',
+        'tay': 'Tây',
+        'west': 'Tây',
+        'w': 'Tây',
+        'nam': 'Nam',
+        'south': 'Nam',
+        's': 'Nam',
+        'bắc': 'Bắc',
+        'bac': 'Bắc',
+        'north': 'Bắc',
+        'n': 'Bắc',
+        'đông nam': 'Đông - Nam',
+        'dong nam': 'Đông - Nam',
+        'southeast': 'Đông - Nam',
+        'đông bắc': 'Đông - Bắc',
+        'dong bac': 'Đông - Bắc',
+        'northeast': 'Đông - Bắc',
+        'tây nam': 'Tây - Nam',
+        'tay nam': 'Tây - Nam',
+        'southwest': 'Tây - Nam',
+        'tây bắc': 'Tây - Bắc',
+        'tay bac': 'Tây - Bắc',
+        'northwest': 'Tây - Bắc',
+    }
+
+    LEGAL_STATUS_MAPPING = {
+        'sổ đỏ': 'Have certificate',
+        'so do': 'Have certificate',
+        'sổ hồng': 'Have certificate',
+        'so hong': 'Have certificate',
+        'có sổ': 'Have certificate',
+        'giấy tờ đầy đủ': 'Have certificate',
+    }
+
+    FURNITURE_MAPPING = {
+        'cao cấp': 'Nội thất cao cấp',
+        'cao cap': 'Nội thất cao cấp',
+        'full': 'Nội thất cao cấp',
+        'đầy đủ': 'Nội thất đầy đủ',
+        'day du': 'Nội thất đầy đủ',
+        'cơ bản': 'Nội thất cơ bản',
+        'co ban': 'Nội thất cơ bản',
+        'không': 'Không có nội thất',
+        'khong': 'Không có nội thất',
+    }
+
+    # Raw input key -> numeric feature columns it fills
+    NUMERIC_MAPPINGS = {
+        'Area': ['Area', 'new_area_log'],
+        'Bedrooms': ['Bedrooms'],
+        'Bathrooms': ['Bathrooms'],
+        'Floors': ['Floors'],
+        'Frontage': ['Frontage'],
+        'AccessRoad': ['Access road width'],
+    }
+
     def __init__(self):
         """Initialize service and load feature schema from model metadata"""
         self.feature_names = []
         self.feature_categories = {}
         self._load_feature_schema()
 
+        # All-zero row and column positions, built once per schema
+        self._feature_index: Dict[str, int] = {name: i for i, name in enumerate(self.feature_names)}
+        self._template = np.zeros(len(self.feature_names), dtype=np.float64)
+
+        # (category, value) -> column of the one-hot feature "category_value"
+        self._onehot_index: Dict[Tuple[str, str], int] = {}
+        for name, idx in self._feature_index.items():
+            category, sep, value = name.partition('_')
+            if sep:
+                self._onehot_index[(category, value)] = idx
+
     def _load_feature_schema(self):
         """Load feature names and categories from model metadata"""
         try:
@@ -69,170 +142,115 @@ class FullPreprocessService:
         Returns:
             DataFrame with single row containing 392 features
         """
-        # Initialize all features to 0
-        features = {name: 0.0 for name in self.feature_names}
-
-        # Map basic numeric features (if they exist in feature_names)
-        numeric_mappings = {
-            'Area': ['Area', 'new_area_log'],
-            'Bedrooms': ['Bedrooms'],
-            'Bathrooms': ['Bathrooms'],
-            'Floors': ['Floors'],
-            'Frontage': ['Frontage'],
-            'AccessRoad': ['Access road width'],
-        }
-
-        for input_key, feature_keys in numeric_mappings.items():
+        # Start from the all-zero row; features not in the schema are skipped
+        row = self._template.copy()
+
+        def set_feature(name: str, value: float) -> None:
+            idx = self._feature_index.get(name)
+            if idx is not None:
+                row[idx] = value
+
+        # Map basic numeric features (if they exist in feature_names); each
+        # input is converted once and reused for the computed features below
+        numeric: Dict[str, float] = {}
+        for input_key, feature_keys in self.NUMERIC_MAPPINGS.items():
             if input_key in data:
-                value = float(data[input_key])
+                value = numeric[input_key] = float(data[input_key])
                 for feature_key in feature_keys:
-                    if feature_key in features:
-                        features[feature_key] = value
+                    set_feature(feature_key, value)
+
+        def set_onehot(category: str, value: str) -> None:
+            idx = self._onehot_index.get((category, value))
+            if idx is not None:
+                row[idx] = 1.0
 
         # Handle one-hot encoded categorical features
         # House direction
         if 'Direction' in data:
-            direction = self._normalize_direction(data['Direction'])
-            feature_name = f"House direction_{direction}"
-            if feature_name in features:
-                features[feature_name] = 1.0
+            set_onehot('House direction', self._normalize_direction(data['Direction']))
 
         # Balcony direction
         if 'BalconyDirection' in data:
-            direction = self._normalize_direction(data['BalconyDirection'])
-            feature_name = f"Balcony direction_{direction}"
-            if feature_name in features:
-                features[feature_name] = 1.0
+            set_onehot('Balcony direction', self._normalize_direction(data['BalconyDirection']))
 
         # Legal status
         if 'LegalStatus' in data:
-            status = self._normalize_legal_status(data['LegalStatus'])
-            feature_name = f"Legal status_{status}"
-            if feature_name in features:
-                features[feature_name] = 1.0
+            set_onehot('Legal status', self._normalize_legal_status(data['LegalStatus']))
 
         # Furniture
         if 'Furniture' in data:
-            furniture = self._normalize_furniture(data['Furniture'])
-            feature_name = f"Furniture_{furniture}"
-            if feature_name in features:
-                features[feature_name] = 1.0
+            set_onehot('Furniture', self._normalize_furniture(data['Furniture']))
 
         # Computed features
-        if 'Area' in data and 'Bedrooms' in data and data['Bedrooms'] > 0:
-            features['new_area_per_bedroom'] = float(data['Area']) / float(data['Bedrooms'])
+        area = numeric.get('Area')
+        bedrooms = numeric.get('Bedrooms')
+        bathrooms = numeric.get('Bathrooms')
+
+        if area is not None and bedrooms is not None and bedrooms > 0:
+            set_feature('new_area_per_bedroom', area / bedrooms)
 
-        if 'Bathrooms' in data and 'Bedrooms' in data and data['Bedrooms'] > 0:
-            features['new_bathroom_bedroom_ratio'] = float(data['Bathrooms']) / float(data['Bedrooms'])
+        if bathrooms is not None and bedrooms is not None and bedrooms > 0:
+            set_feature('new_bathroom_bedroom_ratio', bathrooms / bedrooms)
 
-        if 'Bedrooms' in data and 'Bathrooms' in data:
-            features['new_total_rooms'] = float(data['Bedrooms']) + float(data['Bathrooms'])
+        if bedrooms is not None and bathrooms is not None:
+            set_feature('new_total_rooms', bedrooms + bathrooms)
 
         # Binary flags
-        if 'Frontage' in data:
-            features['has_frontage'] = 1.0 if float(data.get('Frontage', 0)) > 0 else 0.0
+        if 'Frontage' in numeric:
+            set_feature('has_frontage', 1.0 if numeric['Frontage'] > 0 else 0.0)
 
-        if 'AccessRoad' in data:
-            features['new_has_access_road'] = 1.0 if float(data.get('AccessRoad', 0)) > 0 else 0.0
+        if 'AccessRoad' in numeric:
+            set_feature('new_has_access_road', 1.0 if numeric['AccessRoad'] > 0 else 0.0)
 
         # Size categories
-        if 'Area' in data:
-            area = float(data['Area'])
-            features['new_is_large_house'] = 1.0 if area > 100 else 0.0
-            features['new_is_luxury'] = 1.0 if area > 200 else 0.0
+        if area is not None:
+            set_feature('new_is_large_house', 1.0 if area > 100 else 0.0)
+            set_feature('new_is_luxury', 1.0 if area > 200 else 0.0)
 
-        if 'Floors' in data:
-            features['new_is_multi_story'] = 1.0 if float(data.get('Floors', 1)) > 1 else 0.0
+        if 'Floors' in numeric:
+            set_feature('new_is_multi_story', 1.0 if numeric['Floors'] > 1 else 0.0)
 
-        # Create DataFrame
-        df = pd.DataFrame([features])
-
-        # Ensure column order matches training data
-        df = df[self.feature_names]
+        # Single row, already in training column order
+        df = pd.DataFrame(row[None, :], columns=self.feature_names, copy=False)
 
         logger.info(f"Preprocessed to {len(df.columns)} features")
 
         return df
 
+    @staticmethod
+    def _is_missing(value: Any) -> bool:
+        """None, empty string or NaN (scalar check without going through pandas)"""
+        return value is None or value == '' or (isinstance(value, float) and value != value)
+
     def _normalize_direction(self, direction: Any) -> str:
         """Normalize direction values"""
-        if pd.isna(direction) or direction == '' or direction is None:
+        if self._is_missing(direction):
             return 'Không rõ'
 
-        direction_str = str(direction).strip().lower()
-
-        # Mapping table
-        mapping = {
-            'đông': 'Đông',
-            'dong': 'Đông',
-            'east': 'Đông',
-            'e': 'Đông',
-            'tây': 'Tây',
-            'tay': 'Tây',
-            'west': 'Tây',
-            'w': 'Tây',
-            'nam': 'Nam',
-            'south': 'Nam',
-            's': 'Nam',
-            'bắc': 'Bắc',
-            'bac': 'Bắc',
-            'north': 'Bắc',
-            'n': 'Bắc',
-            'đông nam': 'Đông - Nam',
-            'dong nam': 'Đông - Nam',
-            'southeast': 'Đông - Nam',
-            'đông bắc': 'Đông - Bắc',
-            'dong bac': 'Đông - Bắc',
-            'northeast': 'Đông - Bắc',
-            'tây nam': 'Tây - Nam',
-            'tay nam': 'Tây - Nam',
-            'southwest': 'Tây - Nam',
-            'tây bắc': 'Tây - Bắc',
-            'tay bac': 'Tây - Bắc',
-            'northwest': 'Tây - Bắc',
-        }
-
-        return mapping.get(direction_str, 'Không rõ')
+        return self.DIRECTION_MAPPING.get(str(direction).strip().lower(), 'Không rõ')
 
     def _normalize_legal_status(self, status: Any) -> str:
         """Normalize legal status values"""
-        if pd.isna(status) or status == '' or status is None:
+        if self._is_missing(status):
             return 'Không rõ'
 
-        status_str = str(status).strip().lower()
-
-        mapping = {
-            'sổ đỏ': 'Have certificate',
-            'so do': 'Have certificate',
-            'sổ hồng': 'Have certificate',
-            'so hong': 'Have certificate',
-            'có sổ': 'Have certificate',
-            'giấy tờ đầy đủ': 'Have certificate',
-        }
-
-        return mapping.get(status_str, 'Không rõ')
+        return self.LEGAL_STATUS_MAPPING.get(str(status).strip().lower(), 'Không rõ')
 
     def _normalize_furniture(self, furniture: Any) -> str:
         """Normalize furniture values"""
-        if pd.isna(furniture) or furniture == '' or furniture is None:
+        if self._is_missing(furniture):
             return 'Không có nội thất'
 
-        furniture_str = str(furniture).strip().lower()
+        return self.FURNITURE_MAPPING.get(str(furniture).strip().lower(), 'Không rõ')
 
-        mapping = {
-            'cao cấp': 'Nội thất cao cấp',
-            'cao cap': 'Nội thất cao cấp',
-            'full': 'Nội thất cao cấp',
-            'đầy đủ': 'Nội thất đầy đủ',
-            'day du': 'Nội thất đầy đủ',
-            'cơ bản': 'Nội thất cơ bản',
-            'co ban': 'Nội thất cơ bản',
-            'không': 'Không có nội thất',
-            'khong': 'Không có nội thất',
-        }
 
-        return mapping.get(furniture_str, 'Không rõ')
+# Singleton instance (the feature schema is only parsed on first use)
+_full_preprocess_service: Optional[FullPreprocessService] = None
 
 
-# Global instance
-full_preprocess_service = FullPreprocessService()
+def get_full_preprocess_service() -> FullPreprocessService:
+    """Get or create full preprocessing service singleton"""
+    global _full_preprocess_service
+    if _full_preprocess_service is None:
+        _full_preprocess_service = FullPreprocessService()
+    return _full_preprocess_service
@@ -0,0 +1,101 @@
+"""
+LightGBM Fast Single-Row Predictor
+Wraps LGBM_BoosterPredictForMatSingleRowFast: the prediction config and output
+buffer are set up once per model instead of on every single-row call
+"""
+import ctypes
+import threading
+import numpy as np
+from typing import Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from lightgbm.basic import _LIB, _safe_call, _c_str
+except ImportError:
+    _LIB = None
+
+# Constants from LightGBM's c_api.h
+C_API_PREDICT_NORMAL = 0
+C_API_DTYPE_FLOAT64 = 1
+
+
+class LightGBMSingleRowPredictor:
+    """
+    Single-row predictor for a trained LightGBM model.
+
+    The fast config handle owns a reusable prediction buffer, so calls are
+    serialized with a lock (requests run on worker threads).
+    """
+
+    def __init__(self, model: Any, num_features: int, num_threads: int = 0):
+        """
+        Initialize predictor.
+
+        Args:
+            model: LGBMRegressor or lightgbm.Booster
+            num_features: Number of input columns
+            num_threads: OpenMP threads for prediction (0 = LightGBM default)
+        """
+        self.booster = model.booster_ if hasattr(model, "booster_") else model
+        self.num_features = num_features
+        self._lock = threading.Lock()
+        self._handle = ctypes.c_void_p()
+
+        # Same iterations as LGBMRegressor.predict (best iteration if early stopped)
+        num_iteration = self.booster.best_iteration if self.booster.best_iteration > 0 else -1
+
+        _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFastInit(
+            self.booster._handle,
+            ctypes.c_int(C_API_PREDICT_NORMAL),
+            ctypes.c_int(0),
+            ctypes.c_int(num_iteration),
+            ctypes.c_int(C_API_DTYPE_FLOAT64),
+            ctypes.c_int32(num_features),
+            _c_str(f"num_threads={num_threads}" if num_threads > 0 else ""),
+            ctypes.byref(self._handle)
+        ))
+
+    def predict(self, row: np.ndarray) -> float:
+        """
+        Predict a single row.
+
+        Args:
+            row: Feature values in training column order
+
+        Returns:
+            Predicted value
+        """
+        data = np.ascontiguousarray(row, dtype=np.float64).reshape(-1)
+        if data.shape[0] != self.num_features:
+            raise ValueError(f"Expected {self.num_features} features, got {data.shape[0]}")
+
+        out_len = ctypes.c_int64(0)
+        out_result = ctypes.c_double(0.0)
+        with self._lock:
+            _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFast(
+                self._handle,
+                data.ctypes.data_as(ctypes.c_void_p),
+                ctypes.byref(out_len),
+                ctypes.byref(out_result)
+            ))
+        return out_result.value
+
+    def __del__(self):
+        if _LIB is not None and getattr(self, "_handle", None) and self._handle.value:
+            _LIB.LGBM_FastConfigFree(self._handle)
+            self._handle = ctypes.c_void_p()
+
+
+def create_single_row_predictor(
+    model: Any, num_features: int, num_threads: int = 0
+) -> Optional[LightGBMSingleRowPredictor]:
+    """Create a fast single-row predictor, or None if LightGBM's C API isn't usable"""
+    if _LIB is None:
+        return None
+    try:
+        return LightGBMSingleRowPredictor(model, num_features, num_threads)
+    except Exception as e:
+        logger.warning(f"LightGBM fast single-row predict unavailable: {e}")
+        return None
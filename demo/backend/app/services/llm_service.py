@@ -1,7 +1,11 @@
 """
 LLM Parser Service - Parse Vietnamese real estate descriptions using LLM
 """
+import asyncio
+import hashlib
 import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
@@ -30,6 +34,13 @@ class LLMService:
         self.parser: Optional[LLMParser] = None
         self.initialized = False
 
+        # Exact-match LRU cache of parse results, keyed on normalized text
+        self._parse_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+
+        # Bounds concurrent outbound LLM calls from aparse()
+        self._request_semaphore = asyncio.Semaphore(settings.HF_MAX_CONCURRENCY)
+
     def initialize(self) -> bool:
         """
         Initialize LLM parser with HuggingFace token
@@ -83,14 +94,71 @@ class LLMService:
             logger.warning("LLM parser not available - returning empty features")
             return {}
 
+        cache_key = self._cache_key(text)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            logger.info("Parse cache hit")
+            return cached
+
         try:
             features = self.parser.parse(text, verbose=verbose)
             logger.info(f"Parsed features from text: {features}")
-            return features
         except Exception as e:
             logger.error(f"Failed to parse text: {str(e)}")
             return {}
 
+        # Only successful parses are cached so transient LLM failures can retry
+        if features:
+            self._put_cached(cache_key, features)
+        return features
+
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        """Hash of whitespace/case-normalized text"""
+        normalized = " ".join(text.split()).lower()
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+    def _get_cached(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Look up a cached parse result (returns a copy)"""
+        with self._parse_cache_lock:
+            features = self._parse_cache.get(key)
+            if features is None:
+                return None
+            self._parse_cache.move_to_end(key)
+            return dict(features)
+
+    def _put_cached(self, key: bytes, features: Dict[str, Any]) -> None:
+        """Store a parse result, evicting the least recently used entry"""
+        with self._parse_cache_lock:
+            self._parse_cache[key] = dict(features)
+            self._parse_cache.move_to_end(key)
+            while len(self._parse_cache) > settings.LLM_PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+
+    async def aparse(self, text: str, verbose: bool = False) -> Dict[str, Any]:
+        """
+        Async variant of parse() for use inside request handlers
+
+        Cache hits are answered on the event loop. Otherwise the synchronous
+        HuggingFace client (one shared, keep-alive session) runs in the default
+        threadpool, with at most HF_MAX_CONCURRENCY calls in flight.
+
+        Args:
+            text: Description text in Vietnamese
+            verbose: Whether to print verbose output
+
+        Returns:
+            Dictionary of parsed features
+        """
+        if self.is_available():
+            cached = self._get_cached(self._cache_key(text))
+            if cached is not None:
+                logger.info("Parse cache hit")
+                return cached
+
+        async with self._request_semaphore:
+            return await asyncio.to_thread(self.parse, text, verbose)
+
     def is_available(self) -> bool:
         """
         Check if LLM parsing is available
@@ -101,12 +169,6 @@ class LLMService:
         return self.initialized and self.parser is not None
 
 
-# Global LLM service instance
+# Global LLM service instance (initialized by the app lifespan, or lazily
+# on the first parse)
 llm_service = LLMService()
-
-
-# Try to initialize on import (will fail gracefully if token not set)
-try:
-    llm_service.initialize()
-except Exception as e:
-    logger.warning(f"Could not initialize LLM service on import: {str(e)}")
@@ -8,6 +8,7 @@ import json
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from ..core.config import settings
 
@@ -24,6 +25,12 @@ class ModelService:
         self.model_metadata: Dict[str, dict] = {}
         self.loaded = False
 
+        # Runs the per-model predictions of predict_multi_model concurrently
+        self._ensemble_executor: Optional[ThreadPoolExecutor] = None
+
+        # Sorted feature importances per model (fixed once the model is loaded)
+        self._feature_importance_cache: Dict[str, Dict[str, float]] = {}
+
     def load_models(self) -> None:
         """Load all available models from disk"""
         if self.loaded:
@@ -69,6 +76,12 @@ class ModelService:
             self.load_models()
         return list(self.models.keys())
 
+    def get_available_count(self) -> int:
+        """Get number of loaded models (no list built, for health probes)"""
+        if not self.loaded:
+            self.load_models()
+        return len(self.models)
+
     def get_model_info(self, model_name: str) -> Optional[dict]:
         """
         Get information about a specific model
@@ -108,6 +121,23 @@ class ModelService:
         Returns:
             Dictionary with prediction results
         """
+        return self.predict_batch([features], model_name)[0]
+
+    def predict_batch(
+        self,
+        features_list: List[Dict[str, Any]],
+        model_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Make predictions for several inputs with one DataFrame and one model call
+
+        Args:
+            features_list: List of feature dictionaries
+            model_name: Name of model to use (default: use default model)
+
+        Returns:
+            List of prediction result dictionaries, one per input
+        """
         if not self.loaded:
             self.load_models()
 
@@ -119,27 +149,28 @@ class ModelService:
         if model_name not in self.models:
             raise ValueError(f"Model '{model_name}' not found. Available: {self.get_available_models()}")
 
-        # Convert features to DataFrame (single row)
-        feature_df = pd.DataFrame([features])
+        # Convert features to DataFrame (one row per input)
+        feature_df = pd.DataFrame(features_list)
 
         # Get model
         model = self.models[model_name]
 
         # Make prediction
         try:
-            prediction = model.predict(feature_df)[0]
+            predictions = model.predict(feature_df)
 
-            # Convert numpy types to Python types
-            prediction = float(prediction)
+            results = []
+            for features, prediction in zip(features_list, predictions):
+                # Convert numpy types to Python types
+                prediction = float(prediction)
+                results.append({
+                    "prediction": prediction,
+                    "model_used": model_name,
+                    "confidence": self._calculate_confidence(prediction, model_name),
+                    "features_used": features
+                })
 
-            result = {
-                "prediction": prediction,
-                "model_used": model_name,
-                "confidence": self._calculate_confidence(prediction, model_name),
-                "features_used": features
-            }
-
-            return result
+            return results
 
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
@@ -163,24 +194,34 @@ class ModelService:
         if not self.loaded:
             self.load_models()
 
-        # Use all models if not specified
-        if model_names is None:
-            model_names = self.get_available_models()
-
-        # Validate models
+        # Use all models if not specified, otherwise keep the loaded ones
         available = self.get_available_models()
-        model_names = [m for m in model_names if m in available]
+        if model_names is None:
+            model_names = available
+        else:
+            model_names = [m for m in model_names if m in self.models]
 
         if not model_names:
             raise ValueError(f"No valid models specified. Available: {available}")
 
+        if self._ensemble_executor is None:
+            self._ensemble_executor = ThreadPoolExecutor(
+                max_workers=max(1, len(settings.MODEL_FILES)), thread_name_prefix="ensemble"
+            )
+
+        # The boosters release the GIL in their C predict, so models overlap
+        futures = {
+            model_name: self._ensemble_executor.submit(self.predict_single, features, model_name)
+            for model_name in model_names
+        }
+
         # Get predictions from each model
         predictions = {}
         all_preds = []
 
-        for model_name in model_names:
+        for model_name, future in futures.items():
             try:
-                result = self.predict_single(features, model_name)
+                result = future.result()
                 predictions[model_name] = result
                 all_preds.append(result['prediction'])
             except Exception as e:
@@ -260,6 +301,10 @@ class ModelService:
         if model_name not in self.models:
             return None
 
+        cached = self._feature_importance_cache.get(model_name)
+        if cached is not None:
+            return dict(cached)
+
         model = self.models[model_name]
         metadata = self.model_metadata.get(model_name, {})
 
@@ -267,15 +312,13 @@ class ModelService:
         feature_names = metadata.get('feature_names', [])
 
         if hasattr(model, 'feature_importances_') and feature_names:
-            importances = model.feature_importances_
-            feature_importance = dict(zip(feature_names, importances.tolist()))
-            # Sort by importance
-            feature_importance = dict(sorted(
-                feature_importance.items(),
-                key=lambda x: x[1],
-                reverse=True
-            ))
-            return feature_importance
+            importances = np.asarray(model.feature_importances_)[:len(feature_names)]
+            # Sort by importance, descending (stable, so ties keep feature order)
+            order = np.argsort(-importances, kind='stable')
+            values = importances.tolist()
+            feature_importance = {feature_names[i]: values[i] for i in order.tolist()}
+            self._feature_importance_cache[model_name] = feature_importance
+            return dict(feature_importance)
 
         return None
 
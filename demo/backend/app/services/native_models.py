@@ -0,0 +1,126 @@
+"""
+Native Models - Load LightGBM/XGBoost from their own model formats
+The native loaders parse the trees straight into the C++ booster instead of
+unpickling the sklearn wrapper. Export the dumps once with:
+
+    python -m app.services.native_models [models_dir]
+"""
+import sys
+import joblib
+import numpy as np
+from pathlib import Path
+from typing import Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lightgbm as lgb
+except ImportError:
+    lgb = None
+
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+# Native dump file suffix per model key (written next to the pickle)
+NATIVE_SUFFIXES = {
+    "lightgbm": ".txt",
+    "xgboost": ".ubj",
+}
+
+
+class LightGBMNativeModel:
+    """Minimal LGBMRegressor stand-in around a lightgbm.Booster"""
+
+    def __init__(self, booster: Any):
+        self.booster_ = booster
+        self.n_jobs = 0
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # The text dump only holds the trees up to the best iteration
+        return self.booster_.predict(X, num_threads=self.n_jobs)
+
+    def set_params(self, **params) -> "LightGBMNativeModel":
+        self.n_jobs = params.get("n_jobs", self.n_jobs) or 0
+        return self
+
+
+class XGBoostNativeModel:
+    """Minimal XGBRegressor stand-in around an xgboost.Booster"""
+
+    def __init__(self, booster: Any):
+        self._booster = booster
+        # Same trees as XGBRegressor.predict (best iteration if early stopped)
+        best_iteration = booster.attr("best_iteration")
+        self._iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+
+    def get_booster(self) -> Any:
+        return self._booster
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self._booster.inplace_predict(X, iteration_range=self._iteration_range)
+
+    def set_params(self, **params) -> "XGBoostNativeModel":
+        if params.get("n_jobs"):
+            self._booster.set_param({"nthread": params["n_jobs"]})
+        return self
+
+
+def native_model_path(model_name: str, model_path: Path) -> Optional[Path]:
+    """Path of the native dump for a pickled model (None if the model has no native format)"""
+    suffix = NATIVE_SUFFIXES.get(model_name)
+    return model_path.with_suffix(suffix) if suffix else None
+
+
+def load_native_model(model_name: str, model_path: Path) -> Optional[Any]:
+    """
+    Load the native dump of a pickled model if one exists.
+
+    Args:
+        model_name: Model key (lightgbm / xgboost)
+        model_path: Path of the pickled model
+
+    Returns:
+        Predict-compatible model, or None to fall back to the pickle
+    """
+    native_path = native_model_path(model_name, model_path)
+    if native_path is None or not native_path.exists():
+        return None
+
+    try:
+        if model_name == "lightgbm" and lgb is not None:
+            return LightGBMNativeModel(lgb.Booster(model_file=str(native_path)))
+        if model_name == "xgboost" and xgb is not None:
+            booster = xgb.Booster()
+            booster.load_model(str(native_path))
+            return XGBoostNativeModel(booster)
+    except Exception as e:
+        logger.warning(f"Failed to load native {model_name} model, using the pickle: {e}")
+    return None
+
+
+def export_native_models(models_dir: Path) -> None:
+    """Write the native dump next to every pickled LightGBM/XGBoost model in models_dir"""
+    patterns = {
+        "lightgbm": "lightgbm_regressor_*.pkl",
+        "xgboost": "xgboost_regressor_*.pkl",
+    }
+    for model_name, pattern in patterns.items():
+        for model_path in sorted(models_dir.glob(pattern)):
+            model = joblib.load(model_path)
+            native_path = native_model_path(model_name, model_path)
+            if model_name == "lightgbm":
+                booster = model.booster_ if hasattr(model, "booster_") else model
+                booster.save_model(str(native_path))
+            else:
+                booster = model.get_booster() if hasattr(model, "get_booster") else model
+                booster.save_model(str(native_path))
+            logger.info(f"Exported {model_path.name} -> {native_path.name}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    default_dir = Path(__file__).parent.parent.parent / "models"
+    export_native_models(Path(sys.argv[1]) if len(sys.argv) > 1 else default_dir)
@@ -0,0 +1,195 @@
+"""
+Prediction Batcher - Micro-batch concurrent single-model predictions
+Collects requests for up to a few milliseconds, preprocesses them into one
+DataFrame and runs them as one model call
+"""
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from ..core.config import settings
+from .tree_model_service import TreeModelService, get_model_service
+from .tree_preprocess_service import TreePreprocessService, get_preprocess_service
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionBatcher:
+    """
+    Queue-based micro-batcher in front of TreePreprocessService and TreeModelService.
+
+    Each caller awaits a Future; a background task flushes the queue every
+    `max_latency_ms` or as soon as `max_batch_size` items are waiting, then
+    preprocesses all inputs for the same model into one DataFrame and predicts
+    them with a single `predict_batch` call.
+    """
+
+    def __init__(
+        self,
+        model_service: TreeModelService,
+        preprocess_service: TreePreprocessService,
+        max_batch_size: int = 32,
+        max_latency_ms: float = 5.0
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            model_service: Service used to run the batched predictions
+            preprocess_service: Service used to build the batched feature rows
+            max_batch_size: Flush as soon as this many requests are queued
+            max_latency_ms: Longest time a request waits for others to join
+        """
+        self.model_service = model_service
+        self.preprocess_service = preprocess_service
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush task is running"""
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        """Start the background flush task (must be called from a running event loop)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Prediction batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_latency_ms={self.max_latency * 1000:.1f})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background flush task"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+        # Requests still queued would otherwise wait forever
+        queued = []
+        while not self._queue.empty():
+            queued.append(self._queue.get_nowait()[2])
+        self._fail_futures(queued, RuntimeError("Prediction batcher stopped"))
+
+        self._worker = None
+        self._queue = None
+        logger.info("Prediction batcher stopped")
+
+    async def submit(self, features: Dict[str, Any], model_name: str) -> Dict[str, Any]:
+        """
+        Queue a single raw input and wait for its batched prediction.
+
+        Falls back to a direct prediction if the batcher is not running.
+
+        Args:
+            features: Raw input features
+            model_name: Name of model to use
+
+        Returns:
+            Dictionary with prediction results
+        """
+        if not self.running:
+            results = await asyncio.to_thread(self._predict_group, model_name, [features])
+            return results[0]
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, model_name, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Background loop: collect a batch, then flush it"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency
+
+            try:
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._flush(batch)
+            except asyncio.CancelledError:
+                # Stopped while collecting or flushing: don't leave this batch hanging
+                self._fail_futures([future for _, _, future in batch], RuntimeError("Prediction batcher stopped"))
+                raise
+
+    def _predict_group(self, model_name: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Preprocess and predict one model's inputs (blocking; runs in a worker thread)"""
+        features_df = self.preprocess_service.preprocess_batch(records)
+        return self.model_service.predict_batch(features_df, model_name=model_name)
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], str, asyncio.Future]]) -> None:
+        """Run one preprocess + model call per distinct model in the batch and resolve futures"""
+        by_model: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        for features, model_name, future in batch:
+            by_model.setdefault(model_name, []).append((features, future))
+
+        for model_name, items in by_model.items():
+            try:
+                # Off the event loop, so other requests keep being accepted
+                results = await asyncio.to_thread(
+                    self._predict_group, model_name, [f for f, _ in items]
+                )
+            except Exception as e:
+                if len(items) == 1:
+                    self._fail_futures([future for _, future in items], e)
+                else:
+                    # One bad input must not fail the others: retry each on its own
+                    await self._flush_one_by_one(model_name, items)
+                continue
+
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+        if len(batch) > 1:
+            logger.info(f"Flushed prediction batch of {len(batch)} requests")
+
+    async def _flush_one_by_one(self, model_name: str, items: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Predict each input of a failed group separately so only failing inputs get the error"""
+        for features, future in items:
+            try:
+                results = await asyncio.to_thread(self._predict_group, model_name, [features])
+            except Exception as e:
+                self._fail_futures([future], e)
+                continue
+            if not future.done():
+                future.set_result(results[0])
+
+    @staticmethod
+    def _fail_futures(futures: List[asyncio.Future], error: BaseException) -> None:
+        """Resolve the still-pending futures with an exception"""
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+
+# Singleton instance
+_prediction_batcher: Optional[PredictionBatcher] = None
+
+
+def get_prediction_batcher() -> PredictionBatcher:
+    """Get or create prediction batcher singleton"""
+    global _prediction_batcher
+    if _prediction_batcher is None:
+        _prediction_batcher = PredictionBatcher(
+            get_model_service(),
+            get_preprocess_service(),
+            max_batch_size=settings.PREDICT_BATCH_MAX_SIZE,
+            max_latency_ms=settings.PREDICT_BATCH_MAX_LATENCY_MS
+        )
+    return _prediction_batcher
@@ -64,6 +64,18 @@ class PreprocessService:
         "tây bắc": 7, "tay bac": 7, "northwest": 7, "nw": 7,
     }
 
+    # Numeric input fields
+    NUMERIC_FIELDS = ('Area', 'Bedrooms', 'Bathrooms', 'Floors', 'Frontage', 'AccessRoad')
+
+    # Categorical input field -> its encoding table
+    CATEGORICAL_FIELDS = (
+        ('District', DISTRICT_MAPPING),
+        ('LegalStatus', LEGAL_STATUS_MAPPING),
+        ('Furniture', FURNITURE_MAPPING),
+        ('Direction', DIRECTION_MAPPING),
+        ('BalconyDirection', DIRECTION_MAPPING),
+    )
+
     def __init__(self):
         """Initialize preprocessing service"""
         pass
@@ -81,30 +93,14 @@ class PreprocessService:
         processed = data.copy()
 
         # Ensure numeric types
-        numeric_fields = [
-            'Area', 'Bedrooms', 'Bathrooms', 'Floors',
-            'Frontage', 'AccessRoad'
-        ]
-
-        for field in numeric_fields:
+        for field in self.NUMERIC_FIELDS:
             if field in processed:
                 processed[field] = self._to_numeric(processed[field])
 
         # Encode categorical fields
-        if 'District' in processed:
-            processed['District'] = self._encode_district(processed['District'])
-
-        if 'LegalStatus' in processed:
-            processed['LegalStatus'] = self._encode_legal_status(processed['LegalStatus'])
-
-        if 'Furniture' in processed:
-            processed['Furniture'] = self._encode_furniture(processed['Furniture'])
-
-        if 'Direction' in processed:
-            processed['Direction'] = self._encode_direction(processed['Direction'])
-
-        if 'BalconyDirection' in processed:
-            processed['BalconyDirection'] = self._encode_direction(processed['BalconyDirection'])
+        for field, mapping in self.CATEGORICAL_FIELDS:
+            if field in processed:
+                processed[field] = self._encode(processed[field], mapping)
 
         # Fill missing values with defaults
         processed = self._fill_defaults(processed)
@@ -120,47 +116,14 @@ class PreprocessService:
         except (ValueError, TypeError):
             return 0.0
 
-    def _encode_district(self, district: Any) -> int:
-        """Encode district to numeric value"""
-        if isinstance(district, (int, float)):
-            return int(district)
-
-        if isinstance(district, str):
-            district_lower = district.lower().strip()
-            return self.DISTRICT_MAPPING.get(district_lower, 0)
-
-        return 0
-
-    def _encode_legal_status(self, status: Any) -> int:
-        """Encode legal status to numeric value"""
-        if isinstance(status, (int, float)):
-            return int(status)
-
-        if isinstance(status, str):
-            status_lower = status.lower().strip()
-            return self.LEGAL_STATUS_MAPPING.get(status_lower, 0)
-
-        return 0
-
-    def _encode_furniture(self, furniture: Any) -> int:
-        """Encode furniture to numeric value"""
-        if isinstance(furniture, (int, float)):
-            return int(furniture)
-
-        if isinstance(furniture, str):
-            furniture_lower = furniture.lower().strip()
-            return self.FURNITURE_MAPPING.get(furniture_lower, 0)
-
-        return 0
-
-    def _encode_direction(self, direction: Any) -> int:
-        """Encode direction to numeric value"""
-        if isinstance(direction, (int, float)):
-            return int(direction)
+    @staticmethod
+    def _encode(value: Any, mapping: Dict[str, int]) -> int:
+        """Encode a categorical value with its mapping (numbers pass through)"""
+        if isinstance(value, (int, float)):
+            return int(value)
 
-        if isinstance(direction, str):
-            direction_lower = direction.lower().strip()
-            return self.DIRECTION_MAPPING.get(direction_lower, 0)
+        if isinstance(value, str):
+            return mapping.get(value.lower().strip(), 0)
 
         return 0
 
@@ -2,26 +2,86 @@
 Simple prediction service for demo
 Returns realistic predictions based on simple rules
 """
+import random
+import re
+from typing import Dict, Any, List, Optional
+
 import numpy as np
-from typing import Dict, Any
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional - fall back to the plain Python core
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
-def predict_simple(features: Dict[str, Any]) -> float:
-    """
-    Simple prediction based on area and features
 
-    For demo purposes - returns realistic price based on simple formula:
-    Price = base_price * area_multiplier * location_multiplier * quality_multiplier
-    """
-    # Get features with defaults
-    area = float(features.get('Area', 80))
-    bedrooms = float(features.get('Bedrooms', 2))
-    bathrooms = float(features.get('Bathrooms', 2))
-    floors = float(features.get('Floors', 1))
+# Substring lookups (lowercase), built once at import time
+PRIME_DISTRICTS = ('1', '2', '3', '7', 'bình thạnh', 'binh thanh')
+GOOD_DISTRICTS = ('4', '5', '10', '11', 'phú nhuận', 'phu nhuan')
+LUXURY_FURNITURE = ('cao cấp', 'cao cap', 'full')
+FULL_FURNITURE = ('đầy đủ', 'day du')
+CERTIFIED_LEGAL = ('sổ đỏ', 'so do', 'sổ hồng', 'so hong')
+
+
+def _compile_any(substrings) -> re.Pattern:
+    """Compile substrings into one alternation (same result as any(s in text ...))"""
+    return re.compile('|'.join(re.escape(s) for s in substrings))
+
+
+_PRIME_DISTRICTS_RE = _compile_any(PRIME_DISTRICTS)
+_GOOD_DISTRICTS_RE = _compile_any(GOOD_DISTRICTS)
+_LUXURY_FURNITURE_RE = _compile_any(LUXURY_FURNITURE)
+_FULL_FURNITURE_RE = _compile_any(FULL_FURNITURE)
+_CERTIFIED_LEGAL_RE = _compile_any(CERTIFIED_LEGAL)
+
+# Tier codes passed to the numeric core
+TIER_NONE = 0
+TIER_GOOD = 1
+TIER_PRIME = 2
+
+# Price multipliers indexed by tier code
+LOCATION_MULTIPLIERS = (1.0, 1.2, 1.5)  # Other / good / prime districts
+FURNITURE_MULTIPLIERS = (1.0, 1.05, 1.15)  # None / full / luxury furniture
+LEGAL_MULTIPLIERS = (1.0, 1.1)  # No certificate / certificate
+
+# Base price per m2 in HCMC (in VND)
+BASE_PRICE_PER_M2 = 50_000_000  # 50 million VND/m2
+
+
+def _district_tier(district: Any) -> int:
+    """Map a district string to TIER_PRIME / TIER_GOOD / TIER_NONE"""
+    district_str = str(district).lower()
+    if _PRIME_DISTRICTS_RE.search(district_str):
+        return TIER_PRIME
+    if _GOOD_DISTRICTS_RE.search(district_str):
+        return TIER_GOOD
+    return TIER_NONE
+
 
-    # Base price per m2 in HCMC (in VND)
-    base_price_per_m2 = 50_000_000  # 50 million VND/m2
+def _furniture_tier(furniture: Any) -> int:
+    """Map a furniture string to TIER_PRIME (luxury) / TIER_GOOD (full) / TIER_NONE"""
+    furniture_str = str(furniture).lower()
+    if _LUXURY_FURNITURE_RE.search(furniture_str):
+        return TIER_PRIME
+    if _FULL_FURNITURE_RE.search(furniture_str):
+        return TIER_GOOD
+    return TIER_NONE
 
+
+def _legal_tier(legal_status: Any) -> int:
+    """Map a legal status string to TIER_GOOD (certificate) / TIER_NONE"""
+    legal_str = str(legal_status).lower()
+    if _CERTIFIED_LEGAL_RE.search(legal_str):
+        return TIER_GOOD
+    return TIER_NONE
+
+
+@njit(cache=True)
+def _predict_core(area, district_tier, furniture_tier, legal_tier, noise):
+    """Numeric part of predict_simple (JIT-compiled when numba is installed)"""
     # Area multiplier (larger houses cost more per m2)
     if area < 50:
         area_mult = 0.8
@@ -33,36 +93,71 @@ def predict_simple(features: Dict[str, Any]) -> float:
         area_mult = 1.2
 
     # Location multiplier (district)
-    district_str = str(features.get('District', '')).lower()
-    if any(d in district_str for d in ['1', '2', '3', '7', 'bình thạnh', 'binh thanh']):
-        location_mult = 1.5  # Prime districts
-    elif any(d in district_str for d in ['4', '5', '10', '11', 'phú nhuận', 'phu nhuan']):
-        location_mult = 1.2  # Good districts
-    else:
-        location_mult = 1.0  # Other districts
+    location_mult = LOCATION_MULTIPLIERS[district_tier]
 
     # Quality multiplier
-    furniture_str = str(features.get('Furniture', '')).lower()
-    legal_str = str(features.get('LegalStatus', '')).lower()
+    quality_mult = FURNITURE_MULTIPLIERS[furniture_tier] * LEGAL_MULTIPLIERS[legal_tier]
 
-    quality_mult = 1.0
+    # Calculate price
+    price = area * BASE_PRICE_PER_M2 * area_mult * location_mult * quality_mult
 
-    if any(f in furniture_str for f in ['cao cấp', 'cao cap', 'full']):
-        quality_mult *= 1.15
-    elif any(f in furniture_str for f in ['đầy đủ', 'day du']):
-        quality_mult *= 1.05
+    return price * noise
 
-    if any(l in legal_str for l in ['sổ đỏ', 'so do', 'sổ hồng', 'so hong']):
-        quality_mult *= 1.1
 
-    # Calculate price
-    price = area * base_price_per_m2 * area_mult * location_mult * quality_mult
+def predict_simple(features: Dict[str, Any]) -> float:
+    """
+    Simple prediction based on area and features
+
+    For demo purposes - returns realistic price based on simple formula:
+    Price = base_price * area_multiplier * location_multiplier * quality_multiplier
+    """
+    # Get features with defaults
+    area = float(features.get('Area', 80))
 
     # Add some randomness for realism (+/- 10%)
-    noise = np.random.uniform(0.9, 1.1)
-    price = price * noise
+    # random.uniform is much cheaper than numpy's scalar path for one draw
+    noise = random.uniform(0.9, 1.1)
+
+    return _predict_core(
+        area,
+        _district_tier(features.get('District', '')),
+        _furniture_tier(features.get('Furniture', '')),
+        _legal_tier(features.get('LegalStatus', '')),
+        noise
+    )
+
+
+def predict_simple_batch(
+    features_list: List[Dict[str, Any]],
+    noise: Optional[float] = None
+) -> List[float]:
+    """
+    predict_simple for several inputs, with the arithmetic done array-wise
 
-    return price
+    Args:
+        features_list: Feature dictionaries (one per prediction)
+        noise: Fixed noise factor for every input (default: random +/- 10% each)
+
+    Returns:
+        Predicted prices in input order
+    """
+    if not features_list:
+        return []
+
+    area = np.array([float(features.get('Area', 80)) for features in features_list], dtype=np.float64)
+    district = np.array([_district_tier(features.get('District', '')) for features in features_list], dtype=np.intp)
+    furniture = np.array([_furniture_tier(features.get('Furniture', '')) for features in features_list], dtype=np.intp)
+    legal = np.array([_legal_tier(features.get('LegalStatus', '')) for features in features_list], dtype=np.intp)
+
+    # Same rules as _predict_core
+    area_mult = np.select([area < 50, area < 100, area < 150], [0.8, 1.0, 1.1], default=1.2)
+    location_mult = np.asarray(LOCATION_MULTIPLIERS)[district]
+    quality_mult = np.asarray(FURNITURE_MULTIPLIERS)[furniture] * np.asarray(LEGAL_MULTIPLIERS)[legal]
+    if noise is None:
+        noise = np.random.uniform(0.9, 1.1, size=len(features_list))
+
+    price = area * BASE_PRICE_PER_M2 * area_mult * location_mult * quality_mult
+    return (price * noise).tolist()
 
 
 def get_confidence(features: Dict[str, Any]) -> float:
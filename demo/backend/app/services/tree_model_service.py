@@ -6,9 +6,17 @@ import joblib
 import numpy as np
 import pandas as pd
 import json
+import math
+import os
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from ..core.config import settings
+from .compiled_models import CompiledPredictor, compile_model
+from .lightgbm_fast import LightGBMSingleRowPredictor, create_single_row_predictor
+from .native_models import load_native_model
 
 logger = logging.getLogger(__name__)
 
@@ -28,26 +36,43 @@ EXPECTED_FEATURES = [
     "new_district_area_mean", "new_district_area_median", "new_district_area_std",
     "new_district_sample_count", "new_district_tier"
 ]
+EXPECTED_COLUMNS = pd.Index(EXPECTED_FEATURES)
+
+# Input matrix dtype per booster. XGBoost works in float32 internally, so
+# float32 input gives identical predictions without its internal conversion;
+# LightGBM compares thresholds in float64.
+MATRIX_INPUT_DTYPES = {
+    "lightgbm": np.float64,
+    "xgboost": np.float32,
+}
 
 
 class TreeModelService:
     """Service for loading and using tree-based ML models"""
 
-    def __init__(self, models_dir: Optional[Path] = None):
+    def __init__(self, models_dir: Optional[Path] = None, num_threads: int = 0):
         """
         Initialize model service.
         
         Args:
             models_dir: Directory containing trained model files
+            num_threads: Prediction threads per model (0 = model default)
         """
         if models_dir is None:
             # Default to notebooks/models directory (where models are saved)
             models_dir = Path(__file__).parent.parent.parent.parent.parent / "notebooks" / "models"
         
         self.models_dir = Path(models_dir)
+        self.num_threads = num_threads
         self.models: Dict[str, Any] = {}
         self.model_metadata: Dict[str, dict] = {}
+        self.model_paths: Dict[str, Path] = {}
+        self.compiled: Dict[str, CompiledPredictor] = {}
+        self.single_row: Dict[str, LightGBMSingleRowPredictor] = {}
         self.loaded = False
+
+        # Runs the per-model predictions of predict_all_models concurrently
+        self._ensemble_executor: Optional[ThreadPoolExecutor] = None
         
         logger.info(f"TreeModelService initialized with models_dir: {self.models_dir}")
 
@@ -57,7 +82,7 @@ class TreeModelService:
             logger.info("Models already loaded")
             return
 
-        logger.info(f"Loading models from {self.models_dir}")
+        logger.info(f"Loading models from {self.models_dir} (pid {os.getpid()})")
         
         if not self.models_dir.exists():
             logger.warning(f"Models directory not found: {self.models_dir}")
@@ -84,9 +109,27 @@ class TreeModelService:
                     model_path.stem + '_metadata.json'
                 )
 
-                # Load model
-                logger.info(f"Loading {model_name} from {model_path}")
-                self.models[model_name] = joblib.load(model_path)
+                # Load model (native booster dump if exported, else the pickle)
+                model = load_native_model(model_name, model_path)
+                if model is not None:
+                    logger.info(f"Loading {model_name} from its native dump")
+                else:
+                    logger.info(f"Loading {model_name} from {model_path}")
+                    model = joblib.load(model_path)
+                self.models[model_name] = model
+                self.model_paths[model_name] = model_path
+
+                # Cap predict threads so N worker processes don't oversubscribe the CPU
+                if self.num_threads > 0:
+                    self.models[model_name].set_params(n_jobs=self.num_threads)
+
+                # Set up LightGBM's fast single-row predict once per model
+                if model_name == "lightgbm":
+                    predictor = create_single_row_predictor(
+                        self.models[model_name], len(EXPECTED_FEATURES), self.num_threads
+                    )
+                    if predictor is not None:
+                        self.single_row[model_name] = predictor
 
                 # Load metadata if exists
                 if metadata_path.exists():
@@ -108,12 +151,37 @@ class TreeModelService:
         self.loaded = True
         logger.info(f"Loaded {len(self.models)} models: {list(self.models.keys())}")
 
+    def compile_models(self, cache_dir: Optional[Path] = None) -> None:
+        """
+        Compile loaded models to native code (lleaves / Treelite) for faster
+        inference. Models that can't be compiled keep using the pickled model.
+
+        Args:
+            cache_dir: Directory for compiled artifacts (default: models_dir/compiled)
+        """
+        if not self.loaded:
+            self.load_models()
+
+        cache_dir = Path(cache_dir) if cache_dir else self.models_dir / "compiled"
+        for model_name, model in self.models.items():
+            predictor = compile_model(
+                model_name, model, self.model_paths[model_name], cache_dir, self.num_threads
+            )
+            if predictor is not None:
+                self.compiled[model_name] = predictor
+
     def get_available_models(self) -> List[str]:
         """Get list of available model names"""
         if not self.loaded:
             self.load_models()
         return list(self.models.keys())
 
+    def get_available_count(self) -> int:
+        """Get number of loaded models (no list built, for health probes)"""
+        if not self.loaded:
+            self.load_models()
+        return len(self.models)
+
     def get_model_info(self, model_name: str) -> Optional[dict]:
         """Get information about a specific model"""
         if not self.loaded:
@@ -140,6 +208,19 @@ class TreeModelService:
         Returns:
             Dictionary with prediction results
         """
+        return self.predict_batch(features_df, model_name)[0]
+
+    def predict_batch(self, features_df: pd.DataFrame, model_name: str = "lightgbm") -> List[Dict[str, Any]]:
+        """
+        Make predictions for several preprocessed rows with a single model call.
+
+        Args:
+            features_df: DataFrame with one preprocessed row per input (41 columns)
+            model_name: Name of model to use
+
+        Returns:
+            List of prediction result dictionaries, one per row
+        """
         if not self.loaded:
             self.load_models()
 
@@ -149,45 +230,39 @@ class TreeModelService:
         model = self.models[model_name]
 
         try:
-            # Ensure features are in correct order
-            if set(features_df.columns) != set(EXPECTED_FEATURES):
-                missing = set(EXPECTED_FEATURES) - set(features_df.columns)
-                extra = set(features_df.columns) - set(EXPECTED_FEATURES)
-                if missing:
-                    logger.warning(f"Missing features: {missing}")
-                if extra:
-                    logger.warning(f"Extra features: {extra}")
-
-            # Reorder columns to match expected order
-            features_df = features_df[EXPECTED_FEATURES].copy()
-
-            # LightGBM uses underscores instead of spaces in feature names
-            # Rename columns for LightGBM compatibility
-            if model_name == "lightgbm":
-                rename_map = {
-                    "Access Road": "Access_Road",
-                    "House direction": "House_direction",
-                    "Balcony direction": "Balcony_direction",
-                    "Legal status": "Legal_status",
-                    "Furniture state": "Furniture_state"
-                }
-                features_df = features_df.rename(columns=rename_map)
-
-            # Make prediction
-            prediction = model.predict(features_df)[0]
-            prediction = float(prediction)
-
-            # Calculate confidence based on model metadata
-            metadata = self.model_metadata.get(model_name, {})
-            r2_score = metadata.get('r2_score', 0.85)
-            confidence = max(70, min(95, r2_score * 100))
-
-            return {
-                "prediction": prediction,
-                "model_used": model_name,
-                "confidence": confidence,
-                "feature_count": len(features_df.columns)
-            }
+            # Preprocessed frames already come in training order; only other
+            # inputs are checked and reordered
+            if not features_df.columns.equals(EXPECTED_COLUMNS):
+                if set(features_df.columns) != set(EXPECTED_FEATURES):
+                    missing = set(EXPECTED_FEATURES) - set(features_df.columns)
+                    extra = set(features_df.columns) - set(EXPECTED_FEATURES)
+                    if missing:
+                        logger.warning(f"Missing features: {missing}")
+                    if extra:
+                        logger.warning(f"Extra features: {extra}")
+
+                # Reorder columns to match expected order
+                features_df = features_df[EXPECTED_FEATURES]
+            feature_count = len(EXPECTED_FEATURES)
+
+            # Single row (the common /predict shape): fast path without pandas
+            if len(features_df) == 1 and model_name in self.single_row and model_name not in self.compiled:
+                predictions = [self.single_row[model_name].predict(features_df.to_numpy()[0])]
+                return self._format_predictions(model_name, predictions, feature_count)
+
+            # Random Forest (sklearn) was fitted on a DataFrame and checks feature names
+            if model_name not in MATRIX_INPUT_DTYPES:
+                return self._format_predictions(model_name, model.predict(features_df), feature_count)
+
+            # Boosters (and their compiled versions) take the raw matrix in training
+            # column order, which skips their pandas input handling
+            X = features_df.to_numpy(dtype=MATRIX_INPUT_DTYPES[model_name])
+            if model_name in self.compiled:
+                predictions = self.compiled[model_name](X)
+            else:
+                predictions = model.predict(X)
+
+            return self._format_predictions(model_name, predictions, feature_count)
 
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
@@ -195,6 +270,23 @@ class TreeModelService:
             traceback.print_exc()
             raise ValueError(f"Prediction failed: {str(e)}")
 
+    def _format_predictions(self, model_name: str, predictions, feature_count: int) -> List[Dict[str, Any]]:
+        """Build one result dictionary per predicted row"""
+        # Calculate confidence based on model metadata
+        metadata = self.model_metadata.get(model_name, {})
+        r2_score = metadata.get('r2_score', 0.85)
+        confidence = max(70, min(95, r2_score * 100))
+
+        return [
+            {
+                "prediction": float(prediction),
+                "model_used": model_name,
+                "confidence": confidence,
+                "feature_count": feature_count
+            }
+            for prediction in predictions
+        ]
+
     def predict_all_models(self, features_df: pd.DataFrame) -> Dict[str, Any]:
         """
         Make predictions using all available models and return ensemble result.
@@ -208,12 +300,24 @@ class TreeModelService:
         if not self.loaded:
             self.load_models()
 
+        if self._ensemble_executor is None:
+            self._ensemble_executor = ThreadPoolExecutor(
+                max_workers=max(1, len(self.models)), thread_name_prefix="ensemble"
+            )
+
+        # The boosters release the GIL in their C predict, so models overlap.
+        # predict_batch reorders (copies) the frame, so it can be shared.
+        futures = {
+            model_name: self._ensemble_executor.submit(self.predict, features_df, model_name)
+            for model_name in self.models.keys()
+        }
+
         predictions = {}
         confidences = {}
-        
-        for model_name in self.models.keys():
+
+        for model_name, future in futures.items():
             try:
-                result = self.predict(features_df.copy(), model_name)
+                result = future.result()
                 predictions[model_name] = result["prediction"]
                 confidences[model_name] = result["confidence"]
             except Exception as e:
@@ -223,9 +327,18 @@ class TreeModelService:
         if not predictions:
             raise ValueError("No model could make a prediction")
 
-        # Calculate ensemble (simple average)
-        ensemble_pred = sum(predictions.values()) / len(predictions)
-        ensemble_std = float(np.std(list(predictions.values())))
+        # Calculate ensemble (simple average) and population std in one
+        # Welford pass: for a handful of scalars this is much cheaper than
+        # building an array for np.mean / np.std
+        n = 0
+        ensemble_pred = 0.0
+        m2 = 0.0
+        for value in predictions.values():
+            n += 1
+            delta = value - ensemble_pred
+            ensemble_pred += delta / n
+            m2 += delta * (value - ensemble_pred)
+        ensemble_std = math.sqrt(m2 / n)
         ensemble_confidence = sum(confidences.values()) / len(confidences)
 
         return {
@@ -250,6 +363,6 @@ def get_model_service() -> TreeModelService:
     if _model_service is None:
         # Use models from demo/backend/models directory
         models_dir = Path(__file__).parent.parent.parent / "models"
-        _model_service = TreeModelService(models_dir=models_dir)
+        _model_service = TreeModelService(models_dir=models_dir, num_threads=settings.MODEL_NUM_THREADS)
         _model_service.load_models()
     return _model_service
@@ -11,7 +11,7 @@ import pandas as pd
 import numpy as np
 import joblib
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -165,6 +165,17 @@ LEGAL_STATUS_MAPPING = {
     "không rõ": 4, "khong ro": 4,
 }
 
+# Area_binned upper edges: <30 rất nhỏ, <60 nhỏ, <100 trung bình, <150 lớn, else rất lớn
+AREA_BIN_EDGES = (30, 60, 100, 150)
+
+# City-specific area features (area if the listing is in that city, else 0)
+CITY_AREA_FEATURES = (
+    ("area_in_hồ_chí_minh", "Hồ Chí Minh"),
+    ("area_in_hà_nội", "Hà Nội"),
+    ("area_in_bình_dương", "Bình Dương"),
+    ("area_in_đà_nẵng", "Đà Nẵng"),
+)
+
 # Furniture state mapping
 FURNITURE_MAPPING = {
     "cao cấp": 0, "cao cap": 0, "full": 0,
@@ -189,6 +200,9 @@ class TreePreprocessService:
         """
         self.label_encoders = {}
         self.location_stats = None
+
+        # Encoder classes as object-dtype indexes, built on first use per column
+        self._class_index: Dict[str, pd.Index] = {}
         
         if encoders_path and encoders_path.exists():
             try:
@@ -214,7 +228,52 @@ class TreePreprocessService:
         Returns:
             DataFrame with single row containing 41 features
         """
-        # Start with a copy of input
+        return self.preprocess_batch([data])
+
+    def preprocess_batch(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Transform several raw inputs into one DataFrame (one row per input).
+
+        Only the raw field lookups run per record; encoding of the location
+        columns and all derived features are computed column-wise.
+
+        Args:
+            records: Raw input dictionaries with house features
+
+        Returns:
+            DataFrame with one row per record containing 41 features
+        """
+        df = pd.DataFrame.from_records([self._extract_row(data) for data in records])
+
+        # Encode city, district, ward (use label encoder if available, else use hash)
+        for column, source in (('new_city', '_city'), ('new_district', '_district'), ('new_street_ward', '_ward')):
+            df[column] = self._encode_categorical_column(column, df[source].tolist())
+
+        self._add_derived_features(df)
+
+        # Ensure all expected features are present in correct order (drops the
+        # raw '_city', '_district', '_ward' helper columns)
+        missing = [feature for feature in EXPECTED_FEATURES if feature not in df.columns]
+        for feature in missing:
+            logger.warning(f"Missing feature: {feature}, using default 0")
+            df[feature] = 0
+        df = df[EXPECTED_FEATURES]
+
+        logger.info(f"Preprocessed {len(df)} input(s) to {len(df.columns)} features")
+
+        return df
+
+    def _extract_row(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Read and encode the raw fields of a single input.
+
+        Args:
+            data: Raw input dictionary with house features
+
+        Returns:
+            Dictionary of base features plus the raw '_city', '_district'
+            and '_ward' strings (encoded later, column-wise)
+        """
         processed = {}
         
         # === BASIC FEATURES ===
@@ -246,10 +305,8 @@ class TreePreprocessService:
         # === BINARY FLAGS ===
         processed['new_has_balcony_direction'] = 1 if balcony_dir else 0
         processed['new_has_house_direction'] = 1 if direction else 0
-        processed['new_has_access_road'] = 1 if processed['Access Road'] > 0 else 0
-        processed['has_frontage'] = 1 if processed['Frontage'] > 0 else 0
         
-        # === LOCATION FEATURES (Label Encoded) ===
+        # === LOCATION FEATURES ===
         district = data.get('District', data.get('new_district', ''))
         ward = data.get('Ward', data.get('new_street_ward', ''))
 
@@ -265,68 +322,10 @@ class TreePreprocessService:
             city = 'Hồ Chí Minh'
 
         # Normalize city name
-        city = self._normalize_city(city)
-        
-        # Encode city, district, ward (use label encoder if available, else use hash)
-        processed['new_city'] = self._encode_categorical('new_city', city)
-        processed['new_district'] = self._encode_categorical('new_district', district)
-        processed['new_street_ward'] = self._encode_categorical('new_street_ward', ward)
-        
-        # === DERIVED FEATURES ===
-        area = processed['Area']
-        bedrooms = max(processed['Bedrooms'], 1)  # Avoid division by zero
-        bathrooms = processed['Bathrooms']
-        floors = processed['Floors']
-        
-        # Ratio and count features
-        processed['new_bathroom_bedroom_ratio'] = bathrooms / bedrooms
-        processed['new_total_rooms'] = bedrooms + bathrooms
-        processed['new_is_large_house'] = 1 if area > 140 else 0
-        processed['new_avg_room_size'] = area / max(processed['new_total_rooms'], 1)
-        processed['new_is_luxury'] = 1 if bathrooms >= 4 else 0
-        processed['new_is_multi_story'] = 1 if floors > 2 else 0
-        
-        # Area binned (0-4 for 5 bins)
-        if area < 30:
-            processed['Area_binned'] = 0  # Rất nhỏ
-        elif area < 60:
-            processed['Area_binned'] = 1  # Nhỏ
-        elif area < 100:
-            processed['Area_binned'] = 2  # Trung bình
-        elif area < 150:
-            processed['Area_binned'] = 3  # Lớn
-        else:
-            processed['Area_binned'] = 4  # Rất lớn
-        
-        # === INTERACTION FEATURES ===
-        processed['area_x_bathrooms'] = area * bathrooms
-        processed['area_x_bedrooms'] = area * bedrooms
-        processed['area_x_floors'] = area * floors
-        processed['bedrooms_x_bathrooms'] = bedrooms * bathrooms
-        processed['bedrooms_x_floors'] = bedrooms * floors
-        
-        # Luxury score (0-3)
-        luxury_score = 0
-        if bathrooms >= 3:
-            luxury_score += 1
-        if area > 100:
-            luxury_score += 1
-        if processed['Furniture state'] in [0, 1]:  # Cao cấp or đầy đủ
-            luxury_score += 1
-        processed['luxury_score'] = luxury_score
-        
-        # === CITY-SPECIFIC AREA FEATURES ===
-        processed['area_in_hồ_chí_minh'] = area if city == 'Hồ Chí Minh' else 0
-        processed['area_in_hà_nội'] = area if city == 'Hà Nội' else 0
-        processed['area_in_bình_dương'] = area if city == 'Bình Dương' else 0
-        processed['area_in_đà_nẵng'] = area if city == 'Đà Nẵng' else 0
-        
-        # === DENSITY & QUALITY FEATURES ===
-        processed['room_density'] = processed['new_total_rooms'] / max(area, 1)
-        processed['access_quality'] = 0 if processed['Access Road'] == 0 else (
-            1 if processed['Access Road'] < 5 else 2
-        )
-        
+        processed['_city'] = self._normalize_city(city)
+        processed['_district'] = district
+        processed['_ward'] = ward
+
         # === LOCATION STATS (from training data) ===
         # These are district-level aggregated features
         if self.location_stats is not None and district in self.location_stats:
@@ -343,25 +342,55 @@ class TreePreprocessService:
             processed['new_district_area_std'] = 30.0
             processed['new_district_sample_count'] = 100
             processed['new_district_tier'] = 2  # Middle tier
-        
-        # === CREATE DATAFRAME ===
-        # Ensure all expected features are present in correct order
-        result = {}
-        for feature in EXPECTED_FEATURES:
-            if feature in processed:
-                result[feature] = processed[feature]
-            else:
-                logger.warning(f"Missing feature: {feature}, using default 0")
-                result[feature] = 0
-        
-        df = pd.DataFrame([result])
-        
-        # Ensure correct order
-        df = df[EXPECTED_FEATURES]
-        
-        logger.info(f"Preprocessed input to {len(df.columns)} features")
-        
-        return df
+
+        return processed
+
+    def _add_derived_features(self, df: pd.DataFrame) -> None:
+        """Compute the derived features column-wise, in place (city columns need '_city')"""
+        area = df['Area'].to_numpy()
+        bedrooms = np.maximum(df['Bedrooms'].to_numpy(), 1)  # Avoid division by zero
+        bathrooms = df['Bathrooms'].to_numpy()
+        floors = df['Floors'].to_numpy()
+        access_road = df['Access Road'].to_numpy()
+        total_rooms = bedrooms + bathrooms
+
+        # === BINARY FLAGS ===
+        df['new_has_access_road'] = (access_road > 0).astype(np.int64)
+        df['has_frontage'] = (df['Frontage'].to_numpy() > 0).astype(np.int64)
+
+        # Ratio and count features
+        df['new_bathroom_bedroom_ratio'] = bathrooms / bedrooms
+        df['new_total_rooms'] = total_rooms
+        df['new_is_large_house'] = (area > 140).astype(np.int64)
+        df['new_avg_room_size'] = area / np.maximum(total_rooms, 1)
+        df['new_is_luxury'] = (bathrooms >= 4).astype(np.int64)
+        df['new_is_multi_story'] = (floors > 2).astype(np.int64)
+
+        # Area binned (0-4 for 5 bins): <30, <60, <100, <150, rest
+        df['Area_binned'] = np.digitize(area, AREA_BIN_EDGES)
+
+        # === INTERACTION FEATURES ===
+        df['area_x_bathrooms'] = area * bathrooms
+        df['area_x_bedrooms'] = area * bedrooms
+        df['area_x_floors'] = area * floors
+        df['bedrooms_x_bathrooms'] = bedrooms * bathrooms
+        df['bedrooms_x_floors'] = bedrooms * floors
+
+        # Luxury score (0-3); furniture 0/1 = cao cấp / đầy đủ
+        df['luxury_score'] = (
+            (bathrooms >= 3).astype(np.int64)
+            + (area > 100)
+            + np.isin(df['Furniture state'].to_numpy(), (0, 1))
+        )
+
+        # === CITY-SPECIFIC AREA FEATURES ===
+        city = df['_city'].to_numpy()
+        for feature, city_name in CITY_AREA_FEATURES:
+            df[feature] = np.where(city == city_name, area, 0)
+
+        # === DENSITY & QUALITY FEATURES ===
+        df['room_density'] = total_rooms / np.maximum(area, 1)
+        df['access_quality'] = np.where(access_road == 0, 0, np.where(access_road < 5, 1, 2))
 
     def _to_float(self, value: Any, default: float = 0.0) -> float:
         """Convert value to float"""
@@ -438,6 +467,22 @@ class TreePreprocessService:
             return FURNITURE_MAPPING.get(furniture_lower, 1)  # Default to "đầy đủ" (1)
         return 1
 
+    def _encode_categorical_column(self, column: str, values: List[str]) -> np.ndarray:
+        """Encode a whole column with the pre-fitted label encoder (one lookup) or hash"""
+        if column in self.label_encoders:
+            try:
+                # LabelEncoder codes are positions in classes_; exact object
+                # comparison, so values longer than the fixed-width classes
+                # dtype are not truncated into a match. Unknown → -1
+                classes = self._class_index.get(column)
+                if classes is None:
+                    classes = pd.Index(np.asarray(self.label_encoders[column].classes_, dtype=object))
+                    self._class_index[column] = classes
+                return classes.get_indexer(pd.Index(values, dtype=object))
+            except Exception:
+                return np.array([self._encode_categorical(column, value) for value in values])
+        return np.array([self._encode_categorical(column, value) for value in values])
+
     def _encode_categorical(self, column: str, value: str) -> int:
         """Encode categorical value using pre-fitted label encoder or hash"""
         if column in self.label_encoders:
@@ -24,16 +24,12 @@ def format_price(price: float) -> str:
         '950 triệu VND'
     """
     # Model outputs in billions (tỷ), range 1-12
+    if price >= 10:
+        return f"{price:.1f} tỷ VND"
     if price >= 1:
-        # Format as billions (tỷ VND)
-        if price >= 10:
-            return f"{price:.1f} tỷ VND"
-        else:
-            return f"{price:.2f} tỷ VND"
-    else:
-        # Convert to millions for values < 1 billion (rare but possible)
-        millions = price * 1000
-        return f"{millions:.0f} triệu VND"
+        return f"{price:.2f} tỷ VND"
+    # Convert to millions for values < 1 billion (rare but possible)
+    return f"{price * 1000:.0f} triệu VND"
 
 
 def parse_price_input(price_input: Union[str, float, int]) -> float:
@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration - uvicorn workers forked from a preloaded app
+
+With preload_app the master imports app.main once, which loads the models
+(app.api.routes calls get_model_service() at import). The workers are then
+forked and share the boosters' memory copy-on-write instead of each loading
+its own copy as `uvicorn --workers` does.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("UVICORN_WORKERS") or os.cpu_count() or 1)
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+accesslog = None
+
+
+def when_ready(server):
+    """Move the preloaded objects out of the GC's reach before forking, so
+    collections in the workers don't touch (and copy) the shared pages"""
+    gc.freeze()
@@ -92,6 +92,33 @@ class BaseModel(ABC):
 
         return predictions
 
+    def predict_many(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+        """
+        Predict several datasets with a single model call
+
+        Args:
+            datasets: Mapping of label (e.g. 'train', 'test') to features
+
+        Returns:
+            Mapping of label to predictions array
+        """
+        if not self.is_trained:
+            raise ValueError(f"{self.name} is not trained yet!")
+
+        labels = list(datasets.keys())
+        X_all = pd.concat([datasets[label] for label in labels], axis=0, ignore_index=True)
+        predictions_all = self.model.predict(X_all)
+
+        results = {}
+        start = 0
+        for label in labels:
+            end = start + len(datasets[label])
+            results[label] = predictions_all[start:end]
+            self.predictions[label] = results[label]
+            start = end
+
+        return results
+
     def get_feature_importance(self) -> Optional[pd.DataFrame]:
         """
         Get feature importance if available
@@ -146,6 +173,11 @@ class BaseModel(ABC):
         # Save model
         joblib.dump(self.model, model_path)
 
+        # Native booster dump next to the pickle (loaded by the API instead of unpickling)
+        native_path = self.save_native_model(model_path)
+        if native_path:
+            print(f"{self.name} native model saved to {native_path}")
+
         # Save metadata
         metadata = {
             'name': self.name,
@@ -163,6 +195,18 @@ class BaseModel(ABC):
 
         return model_path
 
+    def save_native_model(self, model_path: str) -> Optional[str]:
+        """
+        Save the model in its library's own format next to the pickle
+
+        Args:
+            model_path: Path of the pickled model
+
+        Returns:
+            Path to the native dump, or None if the model has no native format
+        """
+        return None
+
     def load_model(self, model_path: str):
         """
         Load model from disk
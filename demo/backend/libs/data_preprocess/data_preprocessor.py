@@ -40,6 +40,29 @@ class DataPreprocessor:
         if self.verbose:
             print(f"✅ {message}")
     
+    def downcast_numeric(self) -> 'DataPreprocessor':
+        """
+        Downcast int64 columns to the smallest integer type and float64 to float32
+        
+        Returns:
+            self for method chaining
+        """
+        int_cols = self.df.select_dtypes(include=['int64']).columns
+        float_cols = self.df.select_dtypes(include=['float64']).columns
+        
+        if len(int_cols) == 0 and len(float_cols) == 0:
+            return self
+        
+        before = self.df.memory_usage(deep=False).sum()
+        downcast = {col: pd.to_numeric(self.df[col], downcast='integer') for col in int_cols}
+        downcast.update({col: self.df[col].astype(np.float32) for col in float_cols})
+        self.df = self.df.assign(**downcast)
+        after = self.df.memory_usage(deep=False).sum()
+        
+        self._log(f"Downcast {len(int_cols)} integer and {len(float_cols)} float columns "
+                  f"({before / 1024**2:.2f} MB → {after / 1024**2:.2f} MB)")
+        return self
+    
     def add_binary_flag(self, column: str, flag_name: Optional[str] = None) -> 'DataPreprocessor':
         """
         Add binary flag indicating if original value was missing
@@ -59,7 +82,7 @@ class DataPreprocessor:
         if flag_name is None:
             flag_name = f'has_{column.lower().replace(" ", "_").replace("-", "_")}'
         
-        self.df[flag_name] = self.df[column].notna().astype(int)
+        self.df[flag_name] = self.df[column].notna().astype(np.int8)
         self.new_features.append(flag_name)
         self._log(f"Created binary flag '{flag_name}' for '{column}'")
         return self
@@ -118,6 +141,31 @@ class DataPreprocessor:
             self._log(f"Filled {missing_count:,} missing values in '{column}' with median ({median_value:.2f})")
         return self
     
+    def fill_median_bulk(self, columns: List[str]) -> 'DataPreprocessor':
+        """
+        Fill missing values in several numeric columns with their medians at once
+        
+        Args:
+            columns: Column names to fill
+        
+        Returns:
+            self for method chaining
+        """
+        columns = [col for col in columns if col in self.df.columns]
+        if not columns:
+            return self
+        
+        missing_counts = self.df[columns].isna().sum()
+        columns = missing_counts[missing_counts > 0].index.tolist()
+        if not columns:
+            return self
+        
+        medians = self.df[columns].median(numeric_only=True)
+        self.df[columns] = self.df[columns].fillna(medians)
+        for col in columns:
+            self._log(f"Filled {missing_counts[col]:,} missing values in '{col}' with median ({medians[col]:.2f})")
+        return self
+    
     def fill_mode(self, column: str, group_by: Optional[str] = None) -> 'DataPreprocessor':
         """
         Fill missing values with mode (most frequent value)
@@ -270,6 +318,39 @@ class DataPreprocessor:
                 print(f"⚠️ Error creating feature '{feature_name}': {str(e)}")
         return self
     
+    def create_features(self, features: Dict[str, Any]) -> 'DataPreprocessor':
+        """
+        Add several precomputed features in a single assignment
+        
+        Args:
+            features: Mapping of feature name to (values, description)
+        
+        Returns:
+            self for method chaining
+        """
+        if not features:
+            return self
+        
+        try:
+            # Build the new columns as one block and attach them with a single
+            # concat, instead of inserting (and re-consolidating) one at a time
+            new_cols = pd.DataFrame(
+                {name: values for name, (values, _) in features.items()},
+                index=self.df.index
+            )
+            existing = self.df.columns.intersection(new_cols.columns)
+            self.df = pd.concat([self.df.drop(columns=existing), new_cols], axis=1)
+        except Exception as e:
+            if self.verbose:
+                print(f"⚠️ Error creating features {list(features)}: {str(e)}")
+            return self
+        
+        for feature_name, (_, description) in features.items():
+            self.new_features.append(feature_name)
+            desc = description or feature_name
+            self._log(f"Created new feature: {desc} ('{feature_name}')")
+        return self
+    
     def cap_outliers(self, column: str, lower_percentile: float = 1, 
                     upper_percentile: float = 99) -> 'DataPreprocessor':
         """
@@ -376,14 +457,16 @@ class DataPreprocessor:
         # Apply parsing logic and unzip into 3 lists
         cities, districts, street_wards = zip(*self.df[address_column].apply(_parse_location))
         
-        # Assign new columns
-        self.df['new_city'] = cities
-        self.df['new_district'] = districts
-        self.df['new_street_ward'] = street_wards
+        # Assign new columns in one block
+        location_cols = pd.DataFrame(
+            {'new_city': cities, 'new_district': districts, 'new_street_ward': street_wards},
+            index=self.df.index
+        ).fillna('Unknown')
+        existing = self.df.columns.intersection(location_cols.columns)
+        self.df = pd.concat([self.df.drop(columns=existing), location_cols], axis=1)
         
         # Update new features list
         for feature in ['new_city', 'new_district', 'new_street_ward']:
-            self.df[feature] = self.df[feature].fillna('Unknown')
             if feature not in self.new_features:
                 self.new_features.append(feature)
             
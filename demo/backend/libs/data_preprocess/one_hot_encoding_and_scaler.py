@@ -1,9 +1,41 @@
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+# Use pyarrow's multi-threaded CSV parser and Parquet writer when installed
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    PYARROW_AVAILABLE = False
+    CSV_ENGINE = "c"
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba is optional - select_numeric_for_scaling uses a vectorized check instead
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _is_binary(values):
+        """True if every non-NaN value is 0 or 1; exits at the first other value"""
+        for v in values:
+            if v != 0.0 and v != 1.0 and not np.isnan(v):
+                return False
+        return True
+
 
 # =============================
 # LOG FUNCTION
 # =============================
+# Full column lists are only printed when VERBOSE is set (wide frames make them huge)
+VERBOSE = False
+
+
 def log(msg):
     print(f"[LOG] {msg}")
 
@@ -13,7 +45,10 @@ def log(msg):
 # =============================
 def load_dataset(path):
     log(f"Loading dataset from: {path}")
-    df = pd.read_csv(path)
+    if str(path).endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, engine=CSV_ENGINE)
     log(f"Dataset loaded. Shape = {df.shape}")
     return df
 
@@ -25,7 +60,9 @@ def analyze_columns(df):
     log("Analyzing dataset columns...")
 
     numeric_cols = df.select_dtypes(include=["float64", "int64"]).columns.tolist()
-    log(f"Numeric columns detected ({len(numeric_cols)}): {numeric_cols}")
+    log(f"Numeric columns detected: {len(numeric_cols)}")
+    if VERBOSE:
+        log(f"Numeric columns: {numeric_cols}")
 
     low_cat = [
         "House direction",
@@ -42,7 +79,9 @@ def analyze_columns(df):
 
     processed = set(numeric_cols) | set(low_cat) | set(high_cat)
     unprocessed = list(set(df.columns) - processed)
-    log(f"Unprocessed columns (kept as-is): {unprocessed}")
+    log(f"Unprocessed columns (kept as-is): {len(unprocessed)}")
+    if VERBOSE:
+        log(f"Unprocessed columns: {unprocessed}")
 
     return numeric_cols, low_cat, high_cat, unprocessed
 
@@ -51,11 +90,12 @@ def analyze_columns(df):
 # 3. LABEL ENCODING
 # =============================
 def apply_label_encoding(df, high_cat):
-    df = df.copy()
+    # Encodes in place: each column is replaced, the frame itself is not copied
     for col in high_cat:
         log(f"Label Encoding column '{col}' (text → integer).")
-        le = LabelEncoder()
-        df[col] = le.fit_transform(df[col].astype(str))
+        # Categorical codes on the str-cast column give the same sorted
+        # integer mapping as LabelEncoder, via pandas' hashtable factorize
+        df[col] = pd.Categorical(df[col].to_numpy(dtype=str)).codes.astype("int32")
     return df
 
 
@@ -63,8 +103,25 @@ def apply_label_encoding(df, high_cat):
 # 4. ONE-HOT ENCODING
 # =============================
 def apply_one_hot(df, low_cat):
-    log("Applying One-Hot Encoding using pandas.get_dummies()")
-    df_ohe = pd.get_dummies(df[low_cat], prefix=low_cat)
+    log("Applying One-Hot Encoding (factorize + int8 scatter)")
+    n = len(df)
+    rows = np.arange(n)
+    blocks, columns = [], []
+    for col in low_cat:
+        # Same column order as get_dummies: declared categories (including
+        # unused ones, e.g. empty bins) or sorted values. NaN → -1 (all zeros)
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            codes, uniques = df[col].cat.codes.to_numpy(), df[col].cat.categories
+        else:
+            codes, uniques = pd.factorize(df[col], sort=True)
+        block = np.zeros((n, len(uniques)), dtype=np.int8)
+        valid = codes >= 0
+        block[rows[valid], codes[valid]] = 1
+        blocks.append(block)
+        columns.extend(f"{col}_{u}" for u in uniques)
+
+    data = np.concatenate(blocks, axis=1) if blocks else np.zeros((n, 0), dtype=np.int8)
+    df_ohe = pd.DataFrame(data, columns=columns, index=df.index, copy=False)
     log(f"Created {df_ohe.shape[1]} one-hot columns.")
     return df_ohe
 
@@ -81,29 +138,29 @@ def select_numeric_for_scaling(df, numeric_cols, high_cat):
     - Exclude label-encoded categorical columns
     - Scale only real continuous numeric columns
     """
-    cols_to_scale = []
-    cols_skipped = []
-
-    for col in numeric_cols:
-
-        # 1. Skip label-encoded columns
-        if col in high_cat:
-            cols_skipped.append(col)
-            continue
-
-        unique_vals = set(df[col].dropna().unique())
-
-        # 2. Skip binary columns
-        if unique_vals.issubset({0, 1}):
-            cols_skipped.append(col)
-            continue
-
-        # Otherwise → scale
-        cols_to_scale.append(col)
-
-    print("[LOG] Numeric columns detected:", numeric_cols)
-    print("[LOG] Skipped (binary + label-encoded):", cols_skipped)
-    print("[LOG] Continuous numeric columns (WILL SCALE):", cols_to_scale)
+    # 1. Skip label-encoded columns
+    candidates = [col for col in numeric_cols if col not in high_cat]
+
+    # 2. Skip binary columns: every non-null value is 0 or 1. The JIT kernel
+    # stops at the first non-binary value; otherwise one vectorized pass
+    if NUMBA_AVAILABLE:
+        is_binary = {
+            col: _is_binary(df[col].to_numpy(dtype=np.float64, na_value=np.nan))
+            for col in candidates
+        }
+    else:
+        values = df[candidates]
+        is_binary = (values.isin([0, 1]) | values.isna()).all()
+
+    # Otherwise → scale
+    cols_to_scale = [col for col in candidates if not is_binary[col]]
+    cols_skipped = [col for col in numeric_cols if col not in cols_to_scale]
+
+    log(f"Skipped (binary + label-encoded): {len(cols_skipped)}, "
+        f"continuous numeric columns (WILL SCALE): {len(cols_to_scale)}")
+    if VERBOSE:
+        log(f"Skipped: {cols_skipped}")
+        log(f"Will scale: {cols_to_scale}")
 
     return cols_to_scale
 
@@ -114,13 +171,25 @@ def select_numeric_for_scaling(df, numeric_cols, high_cat):
 def scale_numeric_features(df, numeric_cols):
     log("Applying StandardScaler to selected numeric columns...")
 
+    # Standardize a single float32 buffer in place (NaN-aware like StandardScaler;
+    # statistics accumulate in float64) and write it back into the same frame
+    arr = df[numeric_cols].to_numpy(dtype=np.float32, copy=True)
+    mean = np.nanmean(arr, axis=0, dtype=np.float64)
+    var = np.nanvar(arr, axis=0, dtype=np.float64)
+    scale = np.sqrt(var)
+    scale[scale == 0] = 1.0
+    arr -= mean.astype(np.float32)
+    arr /= scale.astype(np.float32)
+    df[numeric_cols] = arr
+
+    # Fitted sklearn scaler with the same statistics, for inverse_transform / reuse
     scaler = StandardScaler()
-    df_scaled = df.copy()
-
-    df_scaled[numeric_cols] = scaler.fit_transform(df[numeric_cols])
+    scaler.mean_, scaler.var_, scaler.scale_ = mean, var, scale
+    scaler.n_features_in_ = len(numeric_cols)
+    scaler.n_samples_seen_ = np.count_nonzero(~np.isnan(arr), axis=0)
 
-    log(f"Scaled columns: {numeric_cols}")
-    return df_scaled, scaler
+    log(f"Scaled {len(numeric_cols)} columns.")
+    return df, scaler
 
 
 # =============================
@@ -128,7 +197,14 @@ def scale_numeric_features(df, numeric_cols):
 # =============================
 def combine_processed(df_ohe, df_scaled):
     log("Combining one-hot features + scaled numeric + label-encoded + others")
-    df_final = pd.concat([df_ohe, df_scaled], axis=1)
+    # Build the result from the existing column arrays so pandas adopts them
+    # instead of re-aligning and copying blocks; duplicate names need concat
+    if df_ohe.columns.intersection(df_scaled.columns).empty:
+        columns = {c: df_ohe[c].to_numpy() for c in df_ohe.columns}
+        columns.update({c: df_scaled[c].array for c in df_scaled.columns})
+        df_final = pd.DataFrame(columns, index=df_scaled.index, copy=False)
+    else:
+        df_final = pd.concat([df_ohe, df_scaled], axis=1)
     log(f"Final dataset shape = {df_final.shape}")
     return df_final
 
@@ -137,7 +213,22 @@ def combine_processed(df_ohe, df_scaled):
 # 8. SAVE FINAL DATASET
 # =============================
 def save_dataset(df, path):
-    log(f"Saving dataset to: {path}")
-    df.to_csv(path, index=False)
+    """
+    Save the final dataset.
+
+    Writes Parquet (zstd, dictionary-encoded) unless the path ends in .csv
+    or pyarrow is not installed, in which case it falls back to to_csv.
+    """
+    path = str(path)
+    if path.endswith(".csv") or not PYARROW_AVAILABLE:
+        if not path.endswith(".csv"):
+            log("pyarrow not installed → falling back to CSV")
+            path = path.rsplit(".", 1)[0] + ".csv"
+        log(f"Saving dataset to: {path}")
+        df.to_csv(path, index=False)
+    else:
+        log(f"Saving dataset to: {path}")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, path, compression="zstd", use_dictionary=True)
     log("Save completed.")
 
@@ -8,7 +8,8 @@ Tree-based models optimized for label-encoded features
 from sklearn.ensemble import RandomForestRegressor
 import xgboost as xgb
 import lightgbm as lgb
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Optional
 
 from .base_model import BaseModel
 
@@ -44,6 +45,12 @@ class XGBoostModel(BaseModel):
         self.model = xgb.XGBRegressor(**self.model_params)
         return self.model
 
+    def save_native_model(self, model_path: str) -> Optional[str]:
+        """Save the booster as UBJSON (model.ubj next to model.pkl)"""
+        native_path = str(Path(model_path).with_suffix('.ubj'))
+        self.model.get_booster().save_model(native_path)
+        return native_path
+
 
 class LightGBMModel(BaseModel):
     """
@@ -58,6 +65,12 @@ class LightGBMModel(BaseModel):
         self.model = lgb.LGBMRegressor(**self.model_params)
         return self.model
 
+    def save_native_model(self, model_path: str) -> Optional[str]:
+        """Save the booster as a text model (model.txt next to model.pkl)"""
+        native_path = str(Path(model_path).with_suffix('.txt'))
+        self.model.booster_.save_model(native_path)
+        return native_path
+
 
 # Model factory - Tree-based models only
 # Optimized for label-encoded features from tree_optimized_preprocessing.py
@@ -9,16 +9,49 @@ import yaml
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import copy
 import json
+import os
+from functools import lru_cache
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+import joblib
+from joblib import Parallel, delayed
 from sklearn.model_selection import train_test_split, GridSearchCV, RandomizedSearchCV
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    # libyaml not available - use the pure-Python loader
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - fall back to the stdlib json encoder
+    orjson = None
+
+# Use pyarrow's multi-threaded CSV parser when it is installed
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
 from .models import create_model, MODEL_REGISTRY
 from .metrics import calculate_metrics, compare_models, create_metrics_report
 from .visualization import create_report_figures
 
 
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML file once per (path, mtime)"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
 class MLPipeline:
     """
     Complete ML Pipeline for training and evaluating multiple models
@@ -41,13 +74,25 @@ class MLPipeline:
         self.y_test = None
         self.feature_names = None
 
+        # Background writer for result files, so saving overlaps figure rendering
+        self._io_executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_writes: List[Future] = []
+
         # Create output directories
         self._create_output_dirs()
 
+    def __getstate__(self):
+        """Drop the writer thread pool when pickled (e.g. into training workers)"""
+        state = self.__dict__.copy()
+        state['_io_executor'] = None
+        state['_pending_writes'] = []
+        return state
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
-        with open(self.config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        path = os.path.abspath(self.config_path)
+        # Deep copy: the pipeline mutates its config (e.g. model n_jobs)
+        config = copy.deepcopy(_load_yaml_cached(path, os.path.getmtime(path)))
         print(f"Configuration loaded from {self.config_path}")
         return config
 
@@ -72,7 +117,10 @@ class MLPipeline:
             data_path = self.config['dataset']['train_path']
 
         print(f"Loading data from {data_path}...")
-        df = pd.read_csv(data_path)
+        if str(data_path).endswith('.parquet'):
+            df = pd.read_parquet(data_path)
+        else:
+            df = pd.read_csv(data_path, engine=CSV_ENGINE)
 
         # Get target column
         target_col = self.config['dataset']['target_column']
@@ -94,19 +142,16 @@ class MLPipeline:
             non_numeric = X.select_dtypes(exclude=[np.number]).columns.tolist()
             if non_numeric:
                 print(f"  Converting {len(non_numeric)} non-numeric columns to numeric...")
-                for col in non_numeric:
-                    # Convert boolean/string columns to int
-                    X[col] = pd.to_numeric(X[col], errors='coerce').fillna(0).astype(int)
+                # Convert boolean/string columns to int (one vectorized pass)
+                X[non_numeric] = (
+                    X[non_numeric].apply(pd.to_numeric, errors='coerce').fillna(0).astype(np.int32)
+                )
                 print(f"  ✓ Converted all columns to numeric")
 
-            # Verify all columns are now numeric
-            remaining_non_numeric = X.select_dtypes(exclude=[np.number]).columns.tolist()
-            if remaining_non_numeric:
-                print(f"  Warning: Still have non-numeric columns: {remaining_non_numeric}")
-                print("  Applying full preprocessing...")
-                X = self._preprocess_features(X)
-            else:
-                print(f"  ✓ All {X.shape[1]} features are numeric")
+            # Every non-numeric column was just converted to int, so no rescan is needed
+            print(f"  ✓ All {X.shape[1]} features are numeric")
+
+        X = self._downcast(X)
 
         # Apply log transform if specified
         if self.config['dataset'].get('use_log_transform', False):
@@ -128,9 +173,9 @@ class MLPipeline:
         Returns:
             Preprocessed DataFrame with only numeric features
         """
-        from sklearn.preprocessing import LabelEncoder
-
         print("Preprocessing features...")
+        # Per-column details only when `verbose: true` is set in the config
+        verbose = self.config.get('verbose', False)
 
         # Columns to drop (used for feature engineering, now redundant)
         columns_to_drop = [
@@ -143,41 +188,51 @@ class MLPipeline:
             print(f"  Dropping redundant columns: {existing_cols_to_drop}")
             X = X.drop(columns=existing_cols_to_drop)
 
+        # Classify every column once; kept up to date as columns are converted
+        dtype_index = {col: self._dtype_kind(dtype) for col, dtype in X.dtypes.items()}
+
         # Identify categorical columns (object dtype)
-        categorical_cols = X.select_dtypes(include=['object']).columns.tolist()
+        categorical_cols = [col for col, kind in dtype_index.items() if kind == 'object']
 
         if categorical_cols:
-            print(f"  Encoding {len(categorical_cols)} categorical columns: {categorical_cols}")
+            print(f"  Encoding {len(categorical_cols)} categorical columns")
 
-            # Apply label encoding to each categorical column
+            # Handle NaN values by filling with a placeholder (one pass for all columns)
+            X[categorical_cols] = X[categorical_cols].fillna('Unknown')
+
+            # Label encode each column: sorted categorical codes give the same
+            # mapping as LabelEncoder in a single factorize pass, as int32
             for col in categorical_cols:
-                # Handle NaN values by filling with a placeholder
-                X[col] = X[col].fillna('Unknown')
-                # Create a new encoder for each column to ensure consistent encoding
-                le = LabelEncoder()
-                X[col] = le.fit_transform(X[col])
-                print(f"    - {col}: {len(le.classes_)} unique values")
+                encoded = pd.Categorical(X[col])
+                X[col] = encoded.codes.astype(np.int32)
+                dtype_index[col] = 'numeric'
+                if verbose:
+                    print(f"    - {col}: {encoded.categories.size} unique values")
 
         # Handle missing values in numeric columns
-        numeric_cols = X.select_dtypes(include=[np.number]).columns.tolist()
+        numeric_cols = [col for col, kind in dtype_index.items() if kind == 'numeric']
         missing_counts = X[numeric_cols].isnull().sum()
         cols_with_missing = missing_counts[missing_counts > 0]
+        fill_cols = cols_with_missing.index.tolist()
 
         if len(cols_with_missing) > 0:
-            print(f"  Filling missing values in {len(cols_with_missing)} numeric columns:")
-            for col in cols_with_missing.index:
-                n_missing = cols_with_missing[col]
-                # Fill with median for numeric columns
-                X[col] = X[col].fillna(X[col].median())
-                print(f"    - {col}: filled {n_missing} missing values with median")
+            print(f"  Filling missing values in {len(cols_with_missing)} numeric columns")
+            # Fill with median for numeric columns (one reduction + one fill)
+            medians = X[fill_cols].median()
+            X[fill_cols] = X[fill_cols].fillna(medians)
+            if verbose:
+                for col, n_missing in cols_with_missing.items():
+                    print(f"    - {col}: filled {n_missing} missing values with median")
 
         # Verify all columns are now numeric
-        non_numeric = X.select_dtypes(exclude=[np.number]).columns.tolist()
+        non_numeric = [col for col, kind in dtype_index.items() if kind != 'numeric']
         if non_numeric:
             raise ValueError(f"Non-numeric columns still present after preprocessing: {non_numeric}")
 
-        # Verify no missing values remain
-        remaining_missing = X.isnull().sum().sum()
+        # Verify no missing values remain. Categoricals were filled with 'Unknown'
+        # and clean columns had none, so only the median-filled columns (all-NaN
+        # ones keep a NaN median) can still have any
+        remaining_missing = int(X[fill_cols].isna().to_numpy().sum()) if fill_cols else 0
         if remaining_missing > 0:
             raise ValueError(f"Missing values still present after preprocessing: {remaining_missing}")
 
@@ -185,6 +240,44 @@ class MLPipeline:
 
         return X
 
+    @staticmethod
+    def _dtype_kind(dtype) -> str:
+        """Classify a dtype as 'object', 'numeric' (np.number, like select_dtypes) or 'other'"""
+        if dtype == object:
+            return 'object'
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            return 'numeric'
+        return 'other'
+
+    def _downcast(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Downcast numeric features to the smallest dtype that holds their values
+        (ints → smallest (u)int, floats → float32; the tree models use float32 anyway)
+
+        Args:
+            X: Numeric features DataFrame
+
+        Returns:
+            DataFrame with downcast dtypes
+        """
+        before = X.memory_usage(deep=True).sum()
+
+        int_cols = X.select_dtypes(include=['integer']).columns
+        if len(int_cols) > 0:
+            mins = X[int_cols].min()
+            X[int_cols] = X[int_cols].apply(
+                lambda col: pd.to_numeric(col, downcast='unsigned' if mins[col.name] >= 0 else 'integer')
+            )
+
+        float_cols = X.select_dtypes(include=['float64']).columns
+        if len(float_cols) > 0:
+            X[float_cols] = X[float_cols].astype(np.float32)
+
+        after = X.memory_usage(deep=True).sum()
+        print(f"Downcast features: {before / 1024**2:.1f} MB → {after / 1024**2:.1f} MB")
+
+        return X
+
     def split_data(self, X: pd.DataFrame, y: pd.Series):
         """
         Split data into train and test sets
@@ -196,9 +289,13 @@ class MLPipeline:
         test_size = self.config['dataset'].get('test_size', 0.2)
         random_state = self.config['dataset']['random_state']
 
-        self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state
+        # Split a row-position array (same shuffle as splitting X directly) and
+        # take the rows once, so sklearn never validates/copies the full frame
+        train_idx, test_idx = train_test_split(
+            np.arange(len(X)), test_size=test_size, random_state=random_state
         )
+        self.X_train, self.X_test = X.iloc[train_idx], X.iloc[test_idx]
+        self.y_train, self.y_test = y.iloc[train_idx], y.iloc[test_idx]
 
         print(f"Data split: {len(self.X_train)} train, {len(self.X_test)} test")
 
@@ -227,11 +324,27 @@ class MLPipeline:
 
     def train_model(self, model_name: str, tune_hyperparameters: bool = False):
         """
-        Train a single model
+        Train a single model and store its results
+
+        Args:
+            model_name: Name of model to train
+            tune_hyperparameters: Whether to perform hyperparameter tuning
+        """
+        result = self._train_one(model_name, tune_hyperparameters)
+        self.models[model_name] = result['model']
+        self.results[model_name] = result
+
+    def _train_one(self, model_name: str, tune_hyperparameters: bool = False) -> Dict[str, Any]:
+        """
+        Train and evaluate a single model without touching self.results
+        (safe to run in a worker process)
 
         Args:
             model_name: Name of model to train
             tune_hyperparameters: Whether to perform hyperparameter tuning
+
+        Returns:
+            Result dictionary for the model
         """
         if model_name not in self.models:
             raise ValueError(f"Model '{model_name}' not initialized!")
@@ -270,9 +383,9 @@ class MLPipeline:
         }
         print(f"CV {scoring}: {cv_score['mean']:.4f} ± {cv_score['std']:.4f}")
 
-        # Make predictions
-        y_train_pred = model.predict(self.X_train, label='train')
-        y_test_pred = model.predict(self.X_test, label='test')
+        # Make predictions (train + test in one model call)
+        predictions = model.predict_many({'train': self.X_train, 'test': self.X_test})
+        y_train_pred, y_test_pred = predictions['train'], predictions['test']
 
         # Inverse transform if log was used
         if self.config['dataset'].get('use_log_transform', False):
@@ -291,8 +404,7 @@ class MLPipeline:
         # Get feature importance
         feature_importance = model.get_feature_importance()
 
-        # Store results
-        self.results[model_name] = {
+        result = {
             'model': model,
             'train_metrics': train_metrics,
             'test_metrics': test_metrics,
@@ -311,6 +423,8 @@ class MLPipeline:
         print(f"\nTest Metrics:")
         self._print_metrics(test_metrics)
 
+        return result
+
     def _tune_hyperparameters(self, model_name: str) -> Dict[str, Any]:
         """
         Perform hyperparameter tuning
@@ -339,7 +453,11 @@ class MLPipeline:
                 cv=cv,
                 scoring=self.config['training']['scoring'],
                 n_jobs=-1,
-                verbose=1
+                pre_dispatch='2*n_jobs',
+                return_train_score=False,
+                refit=True,
+                error_score='raise',
+                verbose=0
             )
         elif method == 'random_search':
             param_distributions = tuning_config['param_distributions']
@@ -351,13 +469,23 @@ class MLPipeline:
                 cv=cv,
                 scoring=self.config['training']['scoring'],
                 n_jobs=-1,
-                verbose=1,
+                pre_dispatch='2*n_jobs',
+                return_train_score=False,
+                refit=True,
+                error_score='raise',
+                verbose=0,
                 random_state=self.config['dataset']['random_state']
             )
         else:
             raise ValueError(f"Unknown tuning method: {method}")
 
-        search.fit(self.X_train, self.y_train)
+        # Dump the training data once and memory-map it so the CV workers share
+        # pages instead of each receiving a pickled copy
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, 'train_data.joblib')
+            joblib.dump((self.X_train, self.y_train), data_path)
+            X_train, y_train = joblib.load(data_path, mmap_mode='r')
+            search.fit(X_train, y_train)
 
         return search.best_params_
 
@@ -372,8 +500,30 @@ class MLPipeline:
         print(f"TRAINING ALL MODELS")
         print(f"{'='*80}\n")
 
-        for model_name in self.models.keys():
-            self.train_model(model_name, tune_hyperparameters)
+        model_names = list(self.models.keys())
+        n_cpus = os.cpu_count() or 1
+        n_workers = min(len(model_names), n_cpus)
+
+        if n_workers <= 1:
+            for model_name in model_names:
+                self.train_model(model_name, tune_hyperparameters)
+        else:
+            # Models are independent: train them in parallel processes and split
+            # the cores between them so the native thread pools don't oversubscribe
+            threads_per_model = max(1, n_cpus // n_workers)
+            for model in self.models.values():
+                if model.model_params.get('n_jobs', -1) == -1:
+                    model.model_params['n_jobs'] = threads_per_model
+
+            print(f"Training {len(model_names)} models in {n_workers} processes "
+                  f"({threads_per_model} threads each)...")
+            results = Parallel(n_jobs=n_workers, backend='loky')(
+                delayed(self._train_one)(model_name, tune_hyperparameters)
+                for model_name in model_names
+            )
+            for model_name, result in zip(model_names, results):
+                self.models[model_name] = result['model']
+                self.results[model_name] = result
 
         print(f"\n{'='*80}")
         print(f"ALL MODELS TRAINED")
@@ -437,9 +587,13 @@ class MLPipeline:
             }
 
         metrics_path = f"{results_dir}/metrics_{timestamp}.json"
-        with open(metrics_path, 'w') as f:
-            json.dump(metrics_data, f, indent=4)
-        print(f"  Metrics saved to {metrics_path}")
+        if orjson is not None:
+            payload = orjson.dumps(metrics_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            payload = json.dumps(metrics_data, indent=4).encode('utf-8')
+        self._pending_writes.append(
+            self._io_executor.submit(self._write_bytes, metrics_path, payload, "Metrics")
+        )
 
         # Save comparison
         comparison_df = compare_models(self.results)
@@ -447,6 +601,18 @@ class MLPipeline:
         comparison_df.to_csv(comparison_path, index=False)
         print(f"  Comparison saved to {comparison_path}")
 
+    @staticmethod
+    def _write_bytes(path: str, payload: bytes, label: str):
+        """Write one result file (runs on the I/O thread) and report it once it exists"""
+        Path(path).write_bytes(payload)
+        print(f"  {label} saved to {path}")
+
+    def wait_for_writes(self):
+        """Block until all background result writes have finished"""
+        for future in self._pending_writes:
+            future.result()
+        self._pending_writes.clear()
+
     def save_report(self):
         """Save text report"""
         if not self.config['output']['save_reports']:
@@ -525,6 +691,7 @@ class MLPipeline:
         self.save_results()
         self.save_report()
         self.save_figures()
+        self.wait_for_writes()
 
         print("\n" + "="*80)
         print("PIPELINE COMPLETED")
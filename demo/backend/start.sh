@@ -22,7 +22,13 @@ if [ -z "$PORT" ]; then
     export PORT=8000
 fi
 
+# One uvicorn worker per CPU core unless UVICORN_WORKERS is set
+if [ -z "$UVICORN_WORKERS" ]; then
+    export UVICORN_WORKERS=$(nproc 2>/dev/null || echo 1)
+fi
+
 echo "✓ Port: $PORT"
+echo "✓ Workers: $UVICORN_WORKERS"
 echo "✓ Debug mode: ${DEBUG:-False}"
 echo "✓ Log level: ${LOG_LEVEL:-INFO}"
 
@@ -33,14 +39,23 @@ if [ -d "models" ]; then
 fi
 
 echo "=================================================="
-echo "Starting uvicorn server..."
-echo ""
 
 # Start the application
-# Use exec to replace shell process with uvicorn (for proper signal handling)
+# Use exec to replace shell process with the server (for proper signal handling)
+if command -v gunicorn >/dev/null 2>&1; then
+    # Models are loaded once in the gunicorn master and shared by the forked workers
+    echo "Starting gunicorn (preloaded app, uvicorn workers)..."
+    echo ""
+    exec gunicorn -c gunicorn.conf.py app.main:app
+fi
+
+echo "Starting uvicorn server..."
+echo ""
 exec uvicorn app.main:app \
     --host 0.0.0.0 \
     --port "$PORT" \
-    --workers 1 \
+    --workers "$UVICORN_WORKERS" \
+    --loop uvloop \
+    --http httptools \
     --log-level "${LOG_LEVEL:-info}" \
     --no-access-log
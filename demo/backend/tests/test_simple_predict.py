@@ -0,0 +1,26 @@
+"""
+Tests for the rule-based simple_predict engine
+"""
+import random
+
+from app.services.simple_predict import predict_simple, predict_simple_batch
+
+FEATURES_LIST = [
+    {'Area': area, 'District': district, 'Furniture': furniture, 'LegalStatus': legal}
+    for area in (30, 50, 99, 120, 200)
+    for district in ('Quận 1', 'Quận 4', 'Gò Vấp')
+    for furniture in ('cao cấp', 'đầy đủ', '')
+    for legal in ('sổ đỏ', '')
+]
+
+
+def test_batch_matches_single_for_fixed_noise(monkeypatch):
+    # predict_simple draws its noise from random.uniform; pin it to 1.0
+    monkeypatch.setattr(random, 'uniform', lambda low, high: 1.0)
+    expected = [predict_simple(features) for features in FEATURES_LIST]
+
+    assert predict_simple_batch(FEATURES_LIST, noise=1.0) == expected
+
+
+def test_empty_batch():
+    assert predict_simple_batch([]) == []
@@ -0,0 +1,33 @@
+"""
+Tests for TreePreprocessService categorical encoding
+"""
+from sklearn.preprocessing import LabelEncoder
+
+from app.services.tree_preprocess_service import TreePreprocessService
+
+
+def make_service() -> TreePreprocessService:
+    service = TreePreprocessService()
+    service.label_encoders = {
+        "new_district": LabelEncoder().fit(["Quận 1", "Quận 10", "Quận 7", "Gò Vấp"])
+    }
+    return service
+
+
+def test_batched_encoding_matches_scalar_encoding():
+    service = make_service()
+    values = ["Quận 1", "Quận 10", "Quận 7", "Gò Vấp", "Bình Thạnh", "", None]
+
+    batched = service._encode_categorical_column("new_district", values)
+
+    assert batched.tolist() == [service._encode_categorical("new_district", v) for v in values]
+
+
+def test_unknown_values_longer_than_classes_are_not_truncated():
+    service = make_service()
+    values = ["Quận 100", "Quận 10 extra", "Quận 1"]
+
+    batched = service._encode_categorical_column("new_district", values)
+
+    assert batched.tolist() == [-1, -1, 1]  # classes_ is sorted: Gò Vấp, Quận 1, ...
+    assert batched.tolist() == [service._encode_categorical("new_district", v) for v in values]